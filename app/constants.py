@@ -44,6 +44,10 @@ class Constants:
 
     SELECTOR_WIDTH = 4
 
+    PATH_CLUSTER_SIZE = 9 # 18x18 map splits into the 4 map quadrants
+    GOAL_PATH_ENGINE = "flow_field" # "flow_field" (shortest paths), "hierarchical" (HPA*, only worth it on large maps: paths up to ~1.2x longer on 128x128, on this 18x18 map no faster than A* with paths up to 2.3x longer), "astar" or "bucket" (Dial's, weighted by LAYER_FLOOR_COSTS)
+    PATH_WAVEFRONT_MIN_TILES = 64 * 64 # Maps this large compute flow fields with NumPy, smaller ones with a plain BFS
+
     ENEMY_HP = 125
     ENEMY_HP_INCREMENT = 5
     ENEMY_SPAWN_COUNT = 5
@@ -58,6 +62,7 @@ class Constants:
     ENEMY_HP_BAR_HEIGHT = SPRITE_ENEMY_RENDER_HEIGHT / 20
     ENEMY_DEATH_ENERGY = 1
     ENEMY_DEATH_PARTICLE_COUNT = 60
+    ENEMY_SPATIAL_HASH_CELL_SIZE = 128 # Close to the tower ranges, a targeting query visits about 3x3 cells
 
     ENERGY_REGEN_VALUE = 2
     ENERGY_REGEN_RATE = 3
@@ -85,11 +90,20 @@ class Constants:
     TOWER_FREEZE_TICK = 3 # Reduce enemy speed for the tick period
     TOWER_FREEZE_CHANCE = 50 # Chance to apply the freeze effect
     TOWER_FREEZE_SPEED_REDUCTION_DIVISION = 4
+    TOWER_TARGETING_ENGINE = "coverage" # "coverage", "candidates" (incremental candidate sets), "spatial_hash" (enemy buckets rebuilt per frame) or "vectorized" (NumPy, suits hundreds of towers and enemies)
 
     BULLET_TTL = 1.5
     BULLET_SPEED = 350
     BULLET_SIZE = 5
     BULLET_HIT_VALUE = 5
+    BULLET_POOL_CAPACITY = 256
+    BULLET_POOL_MAX_CAPACITY = 8192 # Shots beyond the cap are dropped
+
+    PARTICLE_POOL_CAPACITY = 256
+    PARTICLE_POOL_MAX_CAPACITY = 16384
+    COMBAT_TEXT_MAX_COUNT = 512 # Texts beyond the cap are dropped
+    POOL_SHRINK_USAGE = 0.25 # Pools halve once usage falls to this share of the capacity, 0 never shrinks
+
     BUTTON_WIDTH = 64
     BUTTON_HEIGHT = 64
     BUTTON_OFFSET = 16
@@ -106,6 +120,9 @@ class Constants:
     EVENT_RESTART_GAME = "game_restart_game"
     EVENT_SHOOT_BULLET = "shoot_bullet"
     EVENT_EMIT_PARTICLE = "emit_particle"
+    EVENT_TILE_CHANGED = "tile_changed"
+    EVENT_OCCUPANT_MOVED = "occupant_moved"
+    EVENT_ENEMY_DAMAGED = "enemy_damaged"
 
     COLOR_SELECTOR = "purple"
     COLOR_TEXT_ONE = "palegoldenrod"
@@ -148,6 +165,13 @@ class Constants:
         3: SPRITE_END
     }
 
+    LAYER_FLOOR_COSTS = { # Integer cost of walking onto a floor tile, used by the bucket path engine
+        0: 1,
+        1: 1,
+        2: 1,
+        3: 1
+    }
+
     LAYER_COLLISION_SPRITES = {
         0: None,
         1: SPRITE_TALL_TREE,
@@ -25,11 +25,11 @@ class EventDispatcherSingleton:
 
 
         def dispatch(self, event: Event): # TODO: Broadcast event = all listeners | Single event = first listener handles
-            if event.id == "":
-                event.id = str(uuid.uuid4())
             for key, listener in self.listeners.items():
                 handled = listener.on_event(event)
                 if handled:
+                    if event.id == "": # Only needed for the log line, unhandled events skip the uuid
+                        event.id = str(uuid.uuid4())
                     print(f"{key}: {event.id} EVENT: {event.event_name}")
 
 
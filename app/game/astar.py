@@ -1,58 +1,61 @@
 import heapq
 
-def astar(grid, start, goal):
+from game.collision_grid import CollisionGrid
+
+
+def astar(grid: CollisionGrid, start, goal):
     """
     A* pathfinding algorithm for a grid.
 
     Args:
-        grid: 2D list where 0 = walkable, 1 = blocked (obstacle).
+        grid: CollisionGrid where 0 = walkable, 1 = blocked (obstacle), its TileGraph provides the neighbors.
         start: (x, y) tuple for the starting position.
         goal: (x, y) tuple for the target position.
 
     Returns:
         List of (x, y) tuples representing the path, or an empty list if no path found.
     """
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # Cardinal directions (no diagonals)
+    tile_graph = grid.tile_graph
+    cells = grid.cells
+    row_count = tile_graph.row_count
+    goal_x, goal_y = goal
 
 
-    def heuristic(a, b):
+    def heuristic(tile_id):
         """Calculate Manhattan distance as the heuristic."""
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+        x, y = divmod(tile_id, row_count)
+        return abs(x - goal_x) + abs(y - goal_y)
 
 
-    def is_valid(pos):
-        """Check if a position is within bounds and walkable."""
-        x, y = pos
-        return 0 <= x < len(grid) and 0 <= y < len(grid[0]) and grid[x][y] == 0
-
+    start_id = tile_graph.get_id(*start)
+    goal_id = tile_graph.get_id(*goal)
 
     open_set = []
-    heapq.heappush(open_set, (0, start))
+    heapq.heappush(open_set, (0, start_id))
 
-    g_cost = {start: 0}
-    came_from = {}
+    g_cost = [-1] * tile_graph.tile_count
+    g_cost[start_id] = 0
+    came_from = [-1] * tile_graph.tile_count
 
     while open_set:
         _, current = heapq.heappop(open_set)
 
-        if current == goal:
-            path = [current]
-            while current in came_from:
+        if current == goal_id:
+            path = [tile_graph.get_index(current)]
+            while came_from[current] != -1:
                 current = came_from[current]
-                path.append(current)
+                path.append(tile_graph.get_index(current))
             path.reverse()
             return path
 
-        for dx, dy in directions:
-            neighbor = (current[0] + dx, current[1] + dy)
-            if not is_valid(neighbor):
+        tentative_g_cost = g_cost[current] + 1
+        for neighbor in tile_graph.neighbors[current]:
+            if cells[neighbor] != 0:
                 continue
 
-            tentative_g_cost = g_cost[current] + 1
-
-            if neighbor not in g_cost or tentative_g_cost < g_cost[neighbor]:
+            if g_cost[neighbor] == -1 or tentative_g_cost < g_cost[neighbor]:
                 g_cost[neighbor] = tentative_g_cost
-                f_cost = tentative_g_cost + heuristic(neighbor, goal)
+                f_cost = tentative_g_cost + heuristic(neighbor)
                 heapq.heappush(open_set, (f_cost, neighbor))
                 came_from[neighbor] = current
 
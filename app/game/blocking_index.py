@@ -0,0 +1,91 @@
+from dataclasses import dataclass, field
+
+from custom_types.int_vector2 import IntVector2
+from game.collision_grid import CollisionGrid
+from game.tile_graph import TileGraph
+
+
+@dataclass
+class BlockingIndex:
+    """
+    Set of tiles that would cut every path between start and goal when blocked.
+
+    Those tiles are the articulation points separating start from goal, they are found
+    with a single Tarjan DFS rooted at the start tile each time the collision grid
+    changes. Placement checks are then a lookup instead of a full path search.
+    """
+    start_index: IntVector2
+    goal_index: IntVector2
+    blocking: list[bool] = field(default_factory=list)
+    grid_version: int = field(default=-1)
+    tile_graph: TileGraph | None = field(default=None)
+
+
+    def update(self, grid: CollisionGrid):
+        if grid.version != self.grid_version:
+            self.compute(grid)
+
+
+    def compute(self, grid: CollisionGrid):
+        """
+        Rebuild the index.
+
+        Args:
+            grid: CollisionGrid where 0 = walkable, 1 = blocked (obstacle), its TileGraph provides the neighbors.
+        """
+        self.grid_version = grid.version
+        tile_graph = grid.tile_graph
+        neighbors = tile_graph.neighbors
+        cells = grid.cells
+        start = tile_graph.get_id(self.start_index.x, self.start_index.y)
+        goal = tile_graph.get_id(self.goal_index.x, self.goal_index.y)
+
+        discovery = [-1] * tile_graph.tile_count
+        low = [0] * tile_graph.tile_count
+        parent = [-1] * tile_graph.tile_count
+
+        # Iterative DFS, larger maps would exceed the recursion limit
+        # NOTE: the start tile is always walkable, matching astar which never checks it
+        order = 0
+        discovery[start] = low[start] = order
+        stack = [(start, 0)]
+        while stack:
+            current, neighbor_index = stack[-1]
+            current_neighbors = neighbors[current]
+            if neighbor_index == len(current_neighbors):
+                stack.pop()
+                if parent[current] != -1:
+                    low[parent[current]] = min(low[parent[current]], low[current])
+                continue
+
+            stack[-1] = (current, neighbor_index + 1)
+            neighbor = current_neighbors[neighbor_index]
+            if cells[neighbor] != 0 and neighbor != start:
+                continue
+            if discovery[neighbor] == -1:
+                order += 1
+                discovery[neighbor] = low[neighbor] = order
+                parent[neighbor] = current
+                stack.append((neighbor, 0))
+            elif parent[current] != neighbor:
+                low[current] = min(low[current], discovery[neighbor])
+
+        goal_reachable = start == goal or (cells[goal] == 0 and discovery[goal] != -1)
+        self.blocking = [not goal_reachable] * tile_graph.tile_count
+        self.tile_graph = tile_graph
+        if not goal_reachable or start == goal:
+            return
+
+        # Walk the DFS tree from goal to start, an ancestor separates them when the
+        # subtree holding the goal can't reach above it without passing through it
+        self.blocking[goal] = True
+        child = goal
+        while parent[child] != -1:
+            ancestor = parent[child]
+            if ancestor != start and low[child] >= discovery[ancestor]:
+                self.blocking[ancestor] = True
+            child = ancestor
+
+
+    def blocks_goal_path(self, x: int, y: int) -> bool:
+        return self.blocking[self.tile_graph.get_id(x, y)]
@@ -0,0 +1,66 @@
+from game.collision_grid import CollisionGrid
+
+
+def dial_path(grid: CollisionGrid, start, goal, tile_costs=None):
+    """
+    Dial's algorithm (bucket queue Dijkstra) for grids with small integer step costs.
+
+    Costs and parents live in flat lists indexed by tile id, the open set is a ring of
+    max_cost + 1 buckets so pushing and popping never touch a heap.
+
+    Args:
+        grid: CollisionGrid where 0 = walkable, 1 = blocked (obstacle), its TileGraph provides the neighbors.
+        start: (x, y) tuple for the starting position.
+        goal: (x, y) tuple for the target position.
+        tile_costs: Flat sequence with the integer cost (>= 1) of entering each tile, indexed
+            by tile id. Every step costs 1 when omitted, matching astar.
+
+    Returns:
+        List of (x, y) tuples representing the path, or an empty list if no path found.
+    """
+    tile_graph = grid.tile_graph
+    cells = grid.cells
+    cell_count = tile_graph.tile_count
+    max_cost = max(tile_costs) if tile_costs else 1
+    unvisited = cell_count * max_cost + 1
+
+    bucket_count = max_cost + 1
+    buckets = [[] for _ in range(bucket_count)]
+    costs = [unvisited] * cell_count
+    parents = [-1] * cell_count
+
+    start_cell = tile_graph.get_id(*start)
+    goal_cell = tile_graph.get_id(*goal)
+    costs[start_cell] = 0
+    buckets[0].append(start_cell)
+    pending = 1
+    current_cost = 0
+
+    while pending:
+        bucket = buckets[current_cost % bucket_count]
+        while bucket:
+            cell = bucket.pop()
+            pending -= 1
+            if costs[cell] != current_cost:
+                continue # Stale entry, a cheaper cost was already expanded
+
+            if cell == goal_cell:
+                path = []
+                while cell != -1:
+                    path.append(tile_graph.get_index(cell))
+                    cell = parents[cell]
+                path.reverse()
+                return path
+
+            for neighbor in tile_graph.neighbors[cell]:
+                if cells[neighbor] != 0:
+                    continue
+                neighbor_cost = current_cost + (tile_costs[neighbor] if tile_costs else 1)
+                if neighbor_cost < costs[neighbor]:
+                    costs[neighbor] = neighbor_cost
+                    parents[neighbor] = cell
+                    buckets[neighbor_cost % bucket_count].append(neighbor)
+                    pending += 1
+        current_cost += 1
+
+    return []
@@ -1,9 +1,12 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+
+import numpy as np
 import pygame
 
 from renderer import Renderer, RendererType
 from constants import Constants
 from events import Event, GlobalEventDispatcher
+from utils.slot_pool import SlotPool
 
 
 @dataclass
@@ -12,73 +15,46 @@ class BulletConfig:
     effect: str
 
 
-class Bullet:
-    def __init__(self, color, ttl, speed, size, position, direction, bullet_config):
-        self.reset(color, ttl, speed, size, position, direction, bullet_config)
-
-
-    def reset(self, color, ttl, speed, size, position, direction, bullet_config):
-        self.color: str = color
-        self.ttl: float = ttl
-        self.speed: float = bullet_config["speed"]
-        self.size: float = size
-        self.position: pygame.Vector2 = position
-        self.direction: pygame.Vector2 = direction
-        self.bullet_config = bullet_config
-
-
-    def update(self, dt):
-        self.ttl -= 1 * dt
-        if self.ttl <= 0:
-            return
-
-        normalized_direction = self.direction.normalize()
-        move_speed = self.speed * dt
-        velocity = normalized_direction * move_speed
-        self.position.x += velocity.x
-        self.position.y += velocity.y
-
-
-    def draw(self, renderer: Renderer):
-        if self.ttl <= 0:
-            return
-
-        # outline
-        renderer.request_circle_draw(
-            RendererType.BULLET_OUTER,
-            "black",
-            self.position,
-            self.size * 1.5,
-            0)
-
-        # inner
-        renderer.request_circle_draw(
-            RendererType.BULLET_INNER,
-            self.color,
-            self.position,
-            self.size,
-            0)
-
-
-@dataclass
 class BulletManager:
-    bullets: list[Bullet] = field(default_factory=list)
-
-    def __post_init__(self):
+    """
+    Pool of bullets stored in NumPy arrays sized to a SlotPool.
+
+    A bullet is a slot in the arrays, its direction is normalized once when shot.
+    Moving and expiring every bullet is a single array step per frame, drawing and
+    collisions only visit the live slots.
+    """
+    def __init__(self):
+        self.pool = SlotPool(Constants.BULLET_POOL_CAPACITY, Constants.BULLET_POOL_MAX_CAPACITY, Constants.POOL_SHRINK_USAGE)
+        self.capacity = 0
+        self.colors: list[str] = []
+        self.effects: list[str] = []
+        self.active = np.zeros(0, dtype=bool)
+        self.position = np.zeros((0, 2), dtype=np.float64)
+        self.direction = np.zeros((0, 2), dtype=np.float64)
+        self.speed = np.zeros(0, dtype=np.float64)
+        self.ttl = np.zeros(0, dtype=np.float64)
+        self.size = np.zeros(0, dtype=np.float64)
+        self.color_index = np.zeros(0, dtype=np.int64)
+        self.damage = np.zeros(0, dtype=np.int64)
+        self.effect_index = np.zeros(0, dtype=np.int64)
+        self._resize(self.pool.capacity)
         GlobalEventDispatcher.register_listener(self, "BulletManager")
 
 
-    def _rect_contains_circle(self, rect, circle_center, circle_radius):
-        # Unpack circle center
-        cx, cy = circle_center
+    def _resize(self, capacity: int):
+        kept = min(capacity, self.capacity)
+        for name in ["active", "position", "direction", "speed", "ttl", "size", "color_index", "damage", "effect_index"]:
+            array = getattr(self, name)
+            resized = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            resized[:kept] = array[:kept]
+            setattr(self, name, resized)
+        self.capacity = capacity
+
 
-        # Check if the circle is within the rectangle bounds
-        return (
-            rect.left <= cx - circle_radius and  # Circle's leftmost point is inside
-            rect.right >= cx + circle_radius and  # Circle's rightmost point is inside
-            rect.top <= cy - circle_radius and  # Circle's topmost point is inside
-            rect.bottom >= cy + circle_radius   # Circle's bottommost point is inside
-        )
+    def _get_palette_index(self, palette: list[str], value: str) -> int:
+        if value not in palette:
+            palette.append(value)
+        return palette.index(value)
 
 
     def on_event(self, event: Event):
@@ -91,44 +67,123 @@ class BulletManager:
         if direction.x == 0 and direction.y == 0:
             return
 
-        for bullet in self.bullets:
-            if bullet.ttl < 0:
-                bullet.reset(
-                    bullet_config["color"],
-                    Constants.BULLET_TTL,
-                    Constants.BULLET_SPEED,
-                    Constants.BULLET_SIZE,
-                    position,
-                    direction,
-                    bullet_config)
-                return
-
-        bullet = Bullet(
-            bullet_config["color"],
-            Constants.BULLET_TTL,
-            Constants.BULLET_SPEED,
-            Constants.BULLET_SIZE,
-            position,
-            direction,
-            bullet_config)
-        self.bullets.append(bullet)
-
-
-    def get_collisions(self, rect: pygame.Rect) -> Bullet | None:
-        filtered_bullets = [bullet for bullet in self.bullets if bullet.ttl > 0]
-        for bullet in filtered_bullets:
-            if self._rect_contains_circle(rect, bullet.position, bullet.size):
-                bullet.ttl = 0 # Deactivate bullet
-                return bullet
-        return None
+        slot = self.pool.allocate()
+        if slot is None:
+            return
+        if self.pool.capacity != self.capacity:
+            self._resize(self.pool.capacity)
+
+        direction = direction.normalize()
+        self.active[slot] = True
+        self.position[slot] = (position.x, position.y)
+        self.direction[slot] = (direction.x, direction.y)
+        self.speed[slot] = bullet_config["speed"]
+        self.ttl[slot] = Constants.BULLET_TTL
+        self.size[slot] = Constants.BULLET_SIZE
+        self.color_index[slot] = self._get_palette_index(self.colors, bullet_config["color"])
+        self.damage[slot] = bullet_config["damage"]
+        self.effect_index[slot] = self._get_palette_index(self.effects, bullet_config["effect"])
+
+
+    def get_live_slots(self) -> np.ndarray:
+        return np.flatnonzero(self.active)
+
+
+    def get_collisions(self, rect: pygame.Rect) -> BulletConfig | None:
+        return self.get_all_collisions(np.array([rect.left]), np.array([rect.top]), rect.width, rect.height)[0]
+
+
+    def _get_hits(self, live_slots: np.ndarray, lefts: np.ndarray, tops: np.ndarray, width: int, height: int) -> np.ndarray:
+        """
+        Tests every rect against every live bullet at once.
+
+        Returns:
+            Index into live_slots of the hitting bullet or -1 for each rect.
+        """
+        xs = self.position[live_slots, 0]
+        ys = self.position[live_slots, 1]
+        sizes = self.size[live_slots]
+        lefts = np.asarray(lefts)[:, np.newaxis]
+        tops = np.asarray(tops)[:, np.newaxis]
+        inside = ((lefts <= xs - sizes) & (lefts + width >= xs + sizes)
+            & (tops <= ys - sizes) & (tops + height >= ys + sizes))
+
+        # Each rect takes its lowest slot. Rects up to the first one that picked an
+        # already picked bullet are final, the rest retry without the taken bullets
+        hits = np.full(len(lefts), -1, dtype=np.int64)
+        pending = np.flatnonzero(inside.any(axis=1))
+        while len(pending) > 0:
+            picks = inside[pending].argmax(axis=1)
+            _, first_picks = np.unique(picks, return_index=True)
+            final_count = len(pending)
+            if len(first_picks) < len(pending):
+                final_count = int(np.flatnonzero(np.isin(np.arange(len(pending)), first_picks, invert=True))[0])
+            hits[pending[:final_count]] = picks[:final_count]
+            inside[:, picks[:final_count]] = False
+            pending = pending[final_count:]
+            pending = pending[inside[pending].any(axis=1)]
+        return hits
+
+
+    def get_all_collisions(self, lefts: np.ndarray, tops: np.ndarray, width: int, height: int) -> list[BulletConfig | None]:
+        """
+        Resolve the bullet hits of every rect in one pass.
+
+        Rects are resolved in order: the first live bullet whose circle lies inside a
+        rect hits it and is deactivated, so it can't hit a later rect.
+
+        Returns:
+            The config of the colliding bullet or None for each rect.
+        """
+        collisions = [None] * len(lefts)
+        live_slots = self.get_live_slots()
+        if len(live_slots) == 0 or len(lefts) == 0:
+            return collisions
+
+        hits = self._get_hits(live_slots, lefts, tops, width, height)
+
+        hit_rects = np.flatnonzero(hits >= 0)
+        hit_slots = live_slots[hits[hit_rects]]
+        for rect_index, slot in zip(hit_rects.tolist(), hit_slots.tolist()):
+            collisions[rect_index] = BulletConfig(int(self.damage[slot]), self.effects[self.effect_index[slot]])
+        self._free(hit_slots.tolist())
+        return collisions
+
+
+    def _free(self, slots: list[int]):
+        self.active[slots] = False
+        self.pool.free_all(slots)
 
 
     def update(self, dt):
-        for bullet in self.bullets:
-            bullet.update(dt)
+        self.ttl[self.active] -= 1 * dt
+        self._free(np.flatnonzero(self.active & (self.ttl <= 0)).tolist())
+        if self.pool.shrink():
+            self._resize(self.pool.capacity)
 
+        moving = np.flatnonzero(self.active)
+        move_speeds = self.speed[moving] * dt
+        self.position[moving] += self.direction[moving] * move_speeds[:, np.newaxis]
 
-    def draw(self, renderer: Renderer):
-        for bullet in self.bullets:
-            bullet.draw(renderer)
 
+    def draw(self, renderer: Renderer):
+        live_slots = self.get_live_slots()
+        positions = self.position[live_slots].tolist()
+        sizes = self.size[live_slots].tolist()
+        color_indexes = self.color_index[live_slots].tolist()
+        for position, size, color_index in zip(positions, sizes, color_indexes):
+            # outline
+            renderer.request_circle_draw(
+                RendererType.BULLET_OUTER,
+                "black",
+                position,
+                size * 1.5,
+                0)
+
+            # inner
+            renderer.request_circle_draw(
+                RendererType.BULLET_INNER,
+                self.colors[color_index],
+                position,
+                size,
+                0)
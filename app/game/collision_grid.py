@@ -0,0 +1,78 @@
+from game.tile_graph import TileGraph
+
+
+class CollisionGrid:
+    """
+    Compact walkability grid, 0 = walkable, 1 = blocked (obstacle or placed object).
+
+    Cells live in a single column-major bytearray and are updated in place when a tile
+    changes, the cell index is the TileGraph tile id and grid[x][y] indexing is kept too.
+    The version increases on every change, consumers cache results against it or
+    register a cursor and replay the changed cells since their last read. The change
+    log only holds the entries some registered consumer hasn't read yet.
+    """
+    def __init__(self, col_count: int, row_count: int):
+        self.col_count = col_count
+        self.row_count = row_count
+        self.cells = bytearray(col_count * row_count)
+        self.version = 0
+        self.changes: list[int] = [] # Changed cell indexes, changes[0] is the change to change_version + 1
+        self.change_version = 0
+        self.cursors: dict[int, int] = {} # Last read version of every consumer
+        self.tile_graph = TileGraph(col_count, row_count)
+
+        view = memoryview(self.cells)
+        self.columns = [view[x * row_count:(x + 1) * row_count] for x in range(col_count)]
+
+
+    def __len__(self) -> int:
+        return self.col_count
+
+
+    def __getitem__(self, x: int) -> memoryview:
+        return self.columns[x]
+
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        return self.cells[x * self.row_count + y] == 1
+
+
+    def set_blocked(self, x: int, y: int, blocked: bool) -> bool:
+        value = 1 if blocked else 0
+        cell_index = x * self.row_count + y
+        if self.cells[cell_index] == value:
+            return False
+
+        self.cells[cell_index] = value
+        self.version += 1
+        if self.cursors:
+            self.changes.append(cell_index)
+        else:
+            self.change_version = self.version
+        return True
+
+
+    def register_consumer(self) -> int:
+        """
+        Returns:
+            Consumer id for get_changes(), its cursor starts at the current version.
+        """
+        consumer_id = len(self.cursors)
+        self.cursors[consumer_id] = self.version
+        return consumer_id
+
+
+    def get_changes(self, consumer_id: int) -> list[tuple[int, int]]:
+        """
+        Changed (x, y) cells since the consumer's last read, its cursor then moves to the
+        current version and entries every consumer has read are dropped.
+        """
+        start = self.cursors[consumer_id] - self.change_version
+        changes = [divmod(cell_index, self.row_count) for cell_index in self.changes[start:]]
+        self.cursors[consumer_id] = self.version
+
+        oldest_version = min(self.cursors.values())
+        if oldest_version > self.change_version:
+            del self.changes[:oldest_version - self.change_version]
+            self.change_version = oldest_version
+        return changes
@@ -14,7 +14,7 @@ class CombatTextType(Enum):
     FREEZE = "freeze_effect"
 
 
-@dataclass
+@dataclass(slots=True)
 class CombatText:
     combat_text_type: CombatTextType
     text: str
@@ -24,6 +24,10 @@ class CombatText:
     ttl: float
     color: str | pygame.Color
     font_size: int
+    original_ttl: float = field(init=False)
+    color_obj: pygame.Color = field(init=False)
+    color_black_obj: pygame.Color = field(init=False)
+    shadow_pos: pygame.Vector2 = field(init=False)
 
     def __post_init__(self):
         self.reset()
@@ -74,7 +78,7 @@ class CombatText:
 
 @dataclass
 class CombatTextEngine:
-    texts: list[CombatText] = field(default_factory=list)
+    texts: list[CombatText] = field(default_factory=list) # Live texts in spawn order
 
     def __post_init__(self):
         GlobalEventDispatcher.register_listener(self, "CombatTextEngine")
@@ -87,28 +91,17 @@ class CombatTextEngine:
         return False
 
 
-    def _add_text(self, combat_text):
-        for txt in self.texts:
-            if txt.ttl <= 0:
-                txt.combat_text_type = combat_text.combat_text_type
-                txt.text = combat_text.text
-                txt.direction = combat_text.direction
-                txt.ttl = combat_text.ttl
-                txt.move_speed = combat_text.move_speed
-                txt.position = combat_text.position
-                txt.color = combat_text.color
-                txt.font_size = combat_text.font_size
-                txt.reset()
-                return txt
-
-        txt = combat_text
-        self.texts.append(txt)
-        return txt
+    def _add_text(self, combat_text: CombatText) -> CombatText | None:
+        if len(self.texts) >= Constants.COMBAT_TEXT_MAX_COUNT:
+            return None
+        self.texts.append(combat_text)
+        return combat_text
 
 
     def update(self, dt):
         for txt in self.texts:
             txt.update(dt)
+        self.texts[:] = [txt for txt in self.texts if txt.ttl > 0]
 
 
     def draw(self, renderer: Renderer):
@@ -1,53 +1,145 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 import random
 import pygame
 
 from particle_collection import get_death_particle, get_freeze_particle
-from enemy_config import ENEMY_CONFIG
 from game.combat_text import CombatTextType
 from game.combat_text_configs import get_combat_text
 from events import Event, GlobalEventDispatcher
-from game.map_generator import MapConfig
-from game.goal_path_helper import get_goal_path
+from game.goal_path_helper import GoalPathCache
+from game.enemy_archetype import EnemyArchetype
+from game.enemy_store import NO_TILE, SPRITE_DOWN, SPRITE_LEFT, SPRITE_RIGHT, SPRITE_UP, EnemyStore
 from game.tile import Tile
+from game.isometric import screen_to_tile
 from renderer import Renderer, RendererType
-from custom_types.int_vector2 import IntVector2
-from asset_manager import get_asset_manager
+from asset_manager import AssetManagerSingleton
 from constants import Constants
+from utils.slot_map import Handle
 from game.tile_manager import TileManager
 
 
-@dataclass
-class Enemy:
+@dataclass(frozen=True, slots=True)
+class EnemyContext:
+    """
+    Game objects shared by every enemy of an EnemySpawner.
+    """
     tile_manager: TileManager
-    map_config: MapConfig
-    start_tile_index: IntVector2
-    goal_tile_index: IntVector2
-    _hp: int
-    move_speed: float
-    id: str
-    wave_number: int
-    reward: int
-    direction_sprite: str = field(default="")
-    max_hp: int = field(init=False)
-    direction: pygame.Vector2 = field(init=False)
-    goal_path: list[list[int]] = field(init=False)
-    bounds: pygame.Rect = field(init=False)
-    target_reached: bool = field(init=False)
-    processed: bool = field(init=False)
-    _target_pos: pygame.Vector2 = field(init = False)
-    _remaining_health_bar_width: float = field(init=False)
-    _is_freeze: bool = field(default=False)
-    _freeze_elapsed: float = 0
-
-
-    def __post_init__(self):
-        self.reset(self.map_config, self.start_tile_index, self.goal_tile_index, self._hp, self.move_speed, self.wave_number)
-        self.asset_manager = get_asset_manager()
+    goal_path_cache: GoalPathCache
+    asset_manager: AssetManagerSingleton
+    start_position: pygame.Vector2
+
+
+class Enemy:
+    """
+    View of one enemy in the EnemyStore.
+
+    Movement state lives in the store arrays and is updated in batches by the
+    EnemySpawner, the view keeps the path, events and rendering of a single enemy.
+    Its state properties read one slot at a time, per frame loops over all enemies
+    read the store arrays instead.
+    Data shared with other enemies sits in the EnemyContext and EnemyArchetype.
+    """
+    __slots__ = (
+        "context", "archetype", "enemy_store", "id", "handle", "direction_sprite", "spawn_order", "slot",
+        "occupied_tile_index", "goal_path", "goal_path_step", "max_hp", "processed")
+
+    def __init__(self, context: EnemyContext, archetype: EnemyArchetype, enemy_store: EnemyStore, handle: Handle, hp: int, move_speed: float, id: str, direction_sprite: str = "", spawn_order: int = 0):
+        self.context = context
+        self.archetype = archetype
+        self.enemy_store = enemy_store # Read by every state property, replaced by a detached copy on release
+        self.id = id
+        self.handle = handle # Safe to hold after release, EnemySpawner.get_enemy() then returns None
+        self.direction_sprite = direction_sprite
+        self.spawn_order = spawn_order
+        self.slot: int | None = None
+        self.occupied_tile_index: tuple[int, int] | None = None
+        self.goal_path: tuple[tuple[int, int], ...] = ()
+        self.goal_path_step = 0
+        self.reset(hp, move_speed)
+
+
+    @property
+    def _hp(self) -> int:
+        return int(self.enemy_store.hp[self.slot])
+
+
+    @_hp.setter
+    def _hp(self, hp: int):
+        self.enemy_store.hp[self.slot] = hp
+
+
+    @property
+    def move_speed(self) -> float:
+        return float(self.enemy_store.move_speed[self.slot])
+
+
+    @property
+    def target_reached(self) -> bool:
+        return bool(self.enemy_store.target_reached[self.slot])
+
+
+    @target_reached.setter
+    def target_reached(self, target_reached: bool):
+        self.enemy_store.target_reached[self.slot] = target_reached
+
+
+    @property
+    def _is_freeze(self) -> bool:
+        return bool(self.enemy_store.is_freeze[self.slot])
+
+
+    @_is_freeze.setter
+    def _is_freeze(self, is_freeze: bool):
+        self.enemy_store.is_freeze[self.slot] = is_freeze
+
+
+    @property
+    def position(self) -> pygame.Vector2:
+        return pygame.Vector2(*self.enemy_store.position[self.slot].tolist())
+
+
+    @property
+    def direction(self) -> pygame.Vector2:
+        return pygame.Vector2(*self.enemy_store.direction[self.slot].tolist())
+
+
+    @property
+    def bounds(self) -> pygame.Rect:
+        x, y = self.enemy_store.bounds[self.slot].tolist()
+        return pygame.Rect(x, y, Constants.SPRITE_ENEMY_RENDER_WIDTH, Constants.SPRITE_ENEMY_RENDER_HEIGHT)
+
+
+    @property
+    def y_sprite_pos(self) -> float:
+        return float(self.enemy_store.position[self.slot, 1]) - (Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3) * 2
+
+
+    # NOTE:
+    # Unsure about why this is the magic calculation, but I've
+    # called it the y_foot_pos as this is where the enemy's foot is positioned when
+    # rendered with the adjusted y_sprite_pos
+    @property
+    def y_foot_pos(self) -> float:
+        return self.bounds.center[1] - (Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3) * 1
+
+
+    @property
+    def sprite_center(self) -> pygame.Vector2:
+        center = self.bounds.center
+        return pygame.Vector2(center[0], center[1] - (Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3) * 2)
+
+
+    @property
+    def collision_bounds(self) -> pygame.Rect:
+        return pygame.Rect(
+            int(self.enemy_store.position[self.slot, 0]),
+            int(self.y_foot_pos - ((Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3) * 2)),
+            Constants.SPRITE_ENEMY_RENDER_WIDTH,
+            Constants.SPRITE_ENEMY_RENDER_HEIGHT)
 
 
     def alive(self):
-        return self._hp > 0 and not self.target_reached
+        return bool(self.enemy_store.active[self.slot]) and self._hp > 0 and not self.target_reached
 
 
     def is_dead(self):
@@ -57,14 +149,25 @@ class Enemy:
     def calculate_goal_path(self):
         current_tile = self.get_tile()
         if current_tile:
-            self.goal_path = get_goal_path(self.tile_manager, current_tile.index, self.goal_tile_index)
+            # NOTE: the path is shared with other enemies, walk it with goal_path_step instead of popping
+            self.goal_path = self.context.goal_path_cache.get_path(current_tile.index)
+            self.goal_path_step = 0
+
+
+    def get_remaining_goal_path(self) -> tuple[tuple[int, int], ...]:
+        return self.goal_path[self.goal_path_step:]
 
 
     def apply_damage(self, damage: int, effect: str = ""):
         self._hp -= damage
-
-        is_freeze_bunny = any(e["wave"] == self.wave_number and e["name"] == "ice bunny" for e in ENEMY_CONFIG)
-        if effect == Constants.SPRITE_FREEZE_FLOWER and not self._is_freeze and not is_freeze_bunny:
+        GlobalEventDispatcher.dispatch(Event(Constants.EVENT_ENEMY_DAMAGED, {
+            "handle": self.handle,
+            "hp": self._hp,
+            "spawn_order": self.spawn_order,
+            "tile_index": self.occupied_tile_index
+        }))
+
+        if effect == Constants.SPRITE_FREEZE_FLOWER and not self._is_freeze and not self.archetype.is_freeze_immune:
             if random.randint(0, 100) > Constants.TOWER_FREEZE_CHANCE:
                 self._is_freeze = True
                 GlobalEventDispatcher.dispatch(Event(
@@ -77,162 +180,111 @@ class Enemy:
         self.update_death()
 
 
-    def reset(self, map_config: MapConfig, start_tile_index: IntVector2, goal_tile_index: IntVector2, hp: int, move_speed: float, wave_number: int):
-        self.map_config = map_config
-        self.start_tile_index = start_tile_index
-        self.goal_tile_index = goal_tile_index
-        self._hp = hp
+    def reset(self, hp: int, move_speed: float):
         self.max_hp = hp
-        self.move_speed = move_speed
-        self.wave_number = wave_number
-        self.target_reached = False
         self.processed = False
 
-        start_tile_index = self.map_config.start_quadrant.main_index
-        target_position = self.tile_manager.tiles[start_tile_index.y][start_tile_index.x].position.copy()
-
-        self.position = target_position.copy()
-        self.bounds = pygame.Rect(
-            self.position.x,
-            self.position.y,
-            Constants.SPRITE_ENEMY_RENDER_WIDTH,
-            Constants.SPRITE_ENEMY_RENDER_HEIGHT
-        )
-
-        self.sprite_center = pygame.Vector2(
-            self.bounds.center[0],
-            self.bounds.center[1] - (Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3) * 2
-        )
-        self.y_sprite_pos = self.position.y - (Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3) * 2
-        # NOTE:
-        # Unsure about why this is the magic calculation, but I've
-        # called it the y_foot_pos as this is where the enemy's foot is positioned when
-        # rendered with the adjusted y_sprite_pos
-        self.y_foot_pos = self.bounds.center[1] - (Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3) * 1
-        self.collision_bounds = pygame.Rect(
-            self.position.x,
-            self.y_foot_pos - ((Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3) * 2),
-            Constants.SPRITE_ENEMY_RENDER_WIDTH,
-            Constants.SPRITE_ENEMY_RENDER_HEIGHT)
+        start_position = self.context.start_position
+        if self.slot is not None:
+            self.enemy_store.free(self.slot)
+        self.slot = self.enemy_store.allocate(self, start_position.x, start_position.y, hp, move_speed, self.spawn_order)
 
+        self.update_occupied_tile(screen_to_tile(self.bounds.center[0], self.y_foot_pos))
         self.calculate_goal_path()
-        self._target_pos = target_position.copy()
-        self.direction = pygame.Vector2(0, 0)
 
-        self.update_hp_bar()
 
+    def update_occupied_tile(self, tile_index: tuple[int, int] | None):
+        if tile_index != self.occupied_tile_index:
+            self.context.tile_manager.move_occupant(self, self.occupied_tile_index, tile_index)
+            self.occupied_tile_index = tile_index
+            self.enemy_store.tile[self.slot] = tile_index if tile_index is not None else (NO_TILE, NO_TILE)
 
-    def update_position(self, dt):
-        self.direction = self._target_pos - self.position
-        if self.direction.x == 0 and self.direction.y == 0:
-            return
 
-        normalized_direction = self.direction.normalize()
-
-        move_speed = self.move_speed * dt
-        if self._is_freeze:
-            move_speed -= move_speed / Constants.TOWER_FREEZE_SPEED_REDUCTION_DIVISION # Slow down move speed "freeze"
-
-        velocity = normalized_direction * move_speed
-        self.position.x += velocity.x
-        self.position.y += velocity.y
-        self.bounds.x = int(self.position.x)
-        self.bounds.y = int(self.position.y)
-        self.y_sprite_pos = self.position.y - (Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3) * 2
-        self.y_foot_pos = self.bounds.center[1] - (Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3) * 1
-        self.sprite_center.x = self.bounds.center[0]
-        self.sprite_center.y = self.bounds.center[1] - (Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3) * 2
-        self.collision_bounds.x = int(self.position.x)
-        self.collision_bounds.y = int(self.y_foot_pos - ((Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3) * 2))
+    def release(self):
+        self.context.tile_manager.move_occupant(self, self.occupied_tile_index, None)
+        self.occupied_tile_index = None
+        # NOTE: dead enemies stay readable, e.g. by EVENT_ENEMY_DIED listeners holding on to them
+        self.enemy_store = self.enemy_store.detach(self.slot)
+        self.slot = 0
 
 
     def update_move_target(self):
-        distance = self._target_pos.distance_to(self.position)
-        if distance <= Constants.ENEMY_REACHED_DISTANCE:
-            if len(self.goal_path) <= 0:
-                # No more targets in path, end reached
-                self.target_reached = True
-                GlobalEventDispatcher.dispatch(Event(Constants.EVENT_ENEMY_ESCAPED))
-                return
-            else:
-                # Move to next target path tile
-                next_target = self.goal_path.pop(0)
-                self._target_pos = self.tile_manager.tiles[next_target[1]][next_target[0]].position.copy()
-
-
-    def update_sprite_direction(self):
-        if self.direction.x < 0 and self.direction.y < 0:
-            self.direction_sprite = f"{Constants.SPRITE_BUNNY_LEFT}{self.wave_number}"
-        elif self.direction.x > 0 and self.direction.y > 0:
-            self.direction_sprite = f"{Constants.SPRITE_BUNNY_RIGHT}{self.wave_number}"
-        elif self.direction.x < 0 and self.direction.y > 0:
-            self.direction_sprite = f"{Constants.SPRITE_BUNNY_DOWN}{self.wave_number}"
-        elif self.direction.x > 0 and self.direction.y < 0:
-            self.direction_sprite = f"{Constants.SPRITE_BUNNY_UP}{self.wave_number}"
-
-
-    def update_hp_bar(self):
+        # NOTE: called by the EnemySpawner once the enemy is within ENEMY_REACHED_DISTANCE of its target
+        if self.goal_path_step >= len(self.goal_path):
+            # No more targets in path, end reached
+            self.target_reached = True
+            GlobalEventDispatcher.dispatch(Event(Constants.EVENT_ENEMY_ESCAPED))
+        else:
+            # Move to next target path tile
+            next_target = self.goal_path[self.goal_path_step]
+            self.goal_path_step += 1
+            next_position = self.context.tile_manager.tiles[next_target[1]][next_target[0]].position
+            self.enemy_store.target[self.slot] = (next_position.x, next_position.y)
+
+
+    def update_sprite_direction(self, sprite_direction: int):
+        # NOTE: the facing itself is derived in EnemyStore.get_sprite_direction_changes
+        if sprite_direction == SPRITE_LEFT:
+            self.direction_sprite = self.archetype.sprite_left
+        elif sprite_direction == SPRITE_RIGHT:
+            self.direction_sprite = self.archetype.sprite_right
+        elif sprite_direction == SPRITE_DOWN:
+            self.direction_sprite = self.archetype.sprite_down
+        elif sprite_direction == SPRITE_UP:
+            self.direction_sprite = self.archetype.sprite_up
+
+
+    def get_hp_bar_rects(self) -> tuple[pygame.Rect, pygame.Rect]:
         remain_percentage = (self._hp * 100) / self.max_hp
-        self._remaining_health_bar_width = (Constants.ENEMY_HP_BAR_WIDTH * remain_percentage) / 100
+        remaining_health_bar_width = (Constants.ENEMY_HP_BAR_WIDTH * remain_percentage) / 100
 
-        self.used_hp_bar_rect = pygame.Rect(
-            self.position.x,
-            self.y_sprite_pos,
+        x = float(self.enemy_store.position[self.slot, 0])
+        y_sprite_pos = self.y_sprite_pos
+        used_hp_bar_rect = pygame.Rect(
+            x,
+            y_sprite_pos,
             Constants.ENEMY_HP_BAR_WIDTH,
             Constants.ENEMY_HP_BAR_HEIGHT
         )
-        self.remaining_hp_bar_rect = pygame.Rect(
-            self.position.x,
-            self.y_sprite_pos,
-            self._remaining_health_bar_width,
+        remaining_hp_bar_rect = pygame.Rect(
+            x,
+            y_sprite_pos,
+            remaining_health_bar_width,
             Constants.ENEMY_HP_BAR_HEIGHT
         )
+        return used_hp_bar_rect, remaining_hp_bar_rect
 
 
     def update_death(self):
         if not self.processed and self.is_dead():
             self.processed = True
-            GlobalEventDispatcher.dispatch(Event(Constants.EVENT_ENEMY_DIED, {"enemy": self}))
-
-            color = next((e["color"] for e in ENEMY_CONFIG if e["wave"] == self.wave_number), None)
-            color = (pygame.Color(color) if color is not None else pygame.Color(255, 255, 255, 255))
+            GlobalEventDispatcher.dispatch(Event(Constants.EVENT_ENEMY_DIED, {
+                "handle": self.handle,
+                "reward": self.archetype.reward,
+                "position": self.position
+            }))
 
+            color = self.archetype.color
+            sprite_center = self.sprite_center
             GlobalEventDispatcher.dispatch(Event(Constants.EVENT_EMIT_PARTICLE, {
-                "particles": [get_death_particle(self.sprite_center.x, self.sprite_center.y, color) for _ in range(Constants.ENEMY_DEATH_PARTICLE_COUNT)]
+                "particles": [get_death_particle(sprite_center.x, sprite_center.y, color) for _ in range(Constants.ENEMY_DEATH_PARTICLE_COUNT)]
             }))
 
 
-    def update_freeze_effect(self, dt):
+    def emit_freeze_particles(self):
+        # NOTE: the freeze timer itself runs in EnemyStore.update_freeze_timers
         if self._is_freeze:
+            sprite_center = self.sprite_center
             GlobalEventDispatcher.dispatch(Event(Constants.EVENT_EMIT_PARTICLE, {
-                "particles": [get_freeze_particle(self.sprite_center.x, self.sprite_center.y)]
+                "particles": [get_freeze_particle(sprite_center.x, sprite_center.y)]
             }))
-            self._freeze_elapsed += 1 * dt
-            if self._freeze_elapsed >= Constants.TOWER_FREEZE_TICK:
-                self._freeze_elapsed = 0
-                self._is_freeze = False
-
-
-    def update(self, dt):
-        self.update_death()
-
-        if not self.alive():
-            return
-
-        self.update_move_target()
-        self.update_position(dt)
-        self.update_sprite_direction()
-        self.update_hp_bar()
-        self.update_freeze_effect(dt)
 
 
     def get_tile(self) -> Tile | None:
-        for row in range(Constants.ROW_COUNT):
-            for col in range(Constants.COLUMN_COUNT):
-                tile = self.tile_manager.tiles[row][col]
-                if tile.contains_point(self.bounds.center[0], self.y_foot_pos):
-                    return tile
-        return None
+        if self.occupied_tile_index is None:
+            return None
+        col, row = self.occupied_tile_index
+        return self.context.tile_manager.tiles[row][col]
 
 
     def draw_enemy_bounds(self, renderer: Renderer):
@@ -264,11 +316,11 @@ class Enemy:
 
 
     def draw_goal_path(self, renderer: Renderer):
-        for index in self.goal_path:
-            tile = self.tile_manager.tiles[index[1]][index[0]]
+        for index in self.get_remaining_goal_path():
+            tile = self.context.tile_manager.tiles[index[1]][index[0]]
             # renderer.request_on_map_image_draw(
             #     RendererType.FLOOR_TILE,
-            #     self.asset_manager.tile_sprites[Constants.SPRITE_START],
+            #     self.context.asset_manager.tile_sprites[Constants.SPRITE_START],
             #     tile.position,
             #     tile.index.x,
             #     tile.index.y)
@@ -288,16 +340,17 @@ class Enemy:
 
 
     def draw_hp(self, renderer: Renderer):
+        used_hp_bar_rect, remaining_hp_bar_rect = self.get_hp_bar_rects()
         renderer.request_rectangle_draw(
             RendererType.ENEMY_HP_USED,
             "red",
-            self.used_hp_bar_rect,
+            used_hp_bar_rect,
             0)
 
         renderer.request_rectangle_draw(
             RendererType.ENEMY_HP_REMAINING,
             "green",
-            self.remaining_hp_bar_rect,
+            remaining_hp_bar_rect,
             0)
 
 
@@ -317,14 +370,14 @@ class Enemy:
             if self._is_freeze:
                 renderer.request_on_map_image_draw(
                     RendererType.EFFECTS_TILE,
-                    self.asset_manager.tile_sprites[Constants.SPRITE_FREEZE_TILE],
+                    self.context.asset_manager.tile_sprites[Constants.SPRITE_FREEZE_TILE],
                     tile.position,
                     tile.index.x,
                     tile.index.y)
 
             renderer.request_on_map_image_draw(
                 RendererType.ENEMY,
-                self.asset_manager.enemy_frames_sprites[self.direction_sprite],
+                self.context.asset_manager.enemy_frames_sprites[self.direction_sprite],
                 pygame.Vector2(self.position.x, self.y_sprite_pos),
                 tile.index.x,
                 tile.index.y)
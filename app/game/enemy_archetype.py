@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+
+import pygame
+
+from enemy_config import ENEMY_CONFIG
+from constants import Constants
+
+
+@dataclass(frozen=True, slots=True)
+class EnemyArchetype:
+    """
+    Data shared by every enemy of a wave, built once per ENEMY_CONFIG entry.
+    """
+    wave_number: int
+    name: str
+    reward: int
+    color: pygame.Color # Base color of the death particles
+    is_freeze_immune: bool
+    sprite_left: str
+    sprite_right: str
+    sprite_down: str
+    sprite_up: str
+
+
+    @classmethod
+    def from_config(cls, enemy_config: dict) -> "EnemyArchetype":
+        wave_number = enemy_config["wave"]
+        return cls(
+            wave_number,
+            enemy_config["name"],
+            enemy_config["reward"],
+            pygame.Color(enemy_config["color"]),
+            enemy_config["name"] == "ice bunny",
+            f"{Constants.SPRITE_BUNNY_LEFT}{wave_number}",
+            f"{Constants.SPRITE_BUNNY_RIGHT}{wave_number}",
+            f"{Constants.SPRITE_BUNNY_DOWN}{wave_number}",
+            f"{Constants.SPRITE_BUNNY_UP}{wave_number}")
+
+
+ENEMY_ARCHETYPES: dict[int, EnemyArchetype] = {
+    enemy_config["wave"]: EnemyArchetype.from_config(enemy_config) for enemy_config in ENEMY_CONFIG}
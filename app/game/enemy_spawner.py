@@ -1,15 +1,20 @@
 from dataclasses import dataclass, field
 
-from enemy_config import ENEMY_CONFIG
 from events import Event, GlobalEventDispatcher
 from game.energy_manager import EnergyManager
 from utils.random_helper import get_variable_int
 from game.map_generator import MapConfig
+from game.goal_path_helper import GoalPathCache, PathEngine, get_collision_grid, get_flow_field, get_hierarchical_pathfinder, get_tile_costs, update_flow_field
 from renderer import Renderer
 from custom_types.int_vector2 import IntVector2
 from constants import Constants
-from game.enemy import Enemy
+from asset_manager import get_asset_manager
+from game.enemy import Enemy, EnemyContext
+from game.enemy_archetype import ENEMY_ARCHETYPES
+from game.enemy_store import EnemyStore
+from game.tile import Tile
 from game.tile_manager import TileManager
+from utils.slot_map import Handle, SlotMap
 
 
 @dataclass
@@ -19,25 +24,52 @@ class EnemySpawner:
     map_config: MapConfig
     start_tile_index: IntVector2
     goal_tile_index: IntVector2
-    enemies: list[Enemy] = field(default_factory=list)
+    enemies: SlotMap = field(default_factory=SlotMap) # Enemy values, in no particular order
+    enemy_store: EnemyStore = field(default_factory=EnemyStore)
     spawn_id: int = field(default=0)
 
     def __post_init__(self):
         GlobalEventDispatcher.register_listener(self, "EnemySpawner")
+        # Only the structure enemies are routed with is built and kept up to date
+        self.path_engine = PathEngine(Constants.GOAL_PATH_ENGINE)
+        self.flow_field = None
+        hierarchical_pathfinder = None
+        tile_costs = None
+        if self.path_engine == PathEngine.FLOW_FIELD:
+            self.flow_field = get_flow_field(self.tile_manager, self.goal_tile_index)
+        elif self.path_engine == PathEngine.HIERARCHICAL:
+            hierarchical_pathfinder = get_hierarchical_pathfinder(self.tile_manager)
+        elif self.path_engine == PathEngine.BUCKET:
+            tile_costs = get_tile_costs(self.tile_manager)
+        self.goal_path_cache = GoalPathCache(
+            self.goal_tile_index,
+            get_collision_grid(self.tile_manager),
+            self.path_engine,
+            self.flow_field,
+            hierarchical_pathfinder,
+            tile_costs)
+
+        start_tile_index = self.map_config.start_quadrant.main_index
+        self.enemy_context = EnemyContext(
+            self.tile_manager,
+            self.goal_path_cache,
+            get_asset_manager(),
+            self.tile_manager.tiles[start_tile_index.y][start_tile_index.x].position.copy())
 
 
     def on_event(self, event) -> bool:
         if event.event_name == Constants.EVENT_SPAWN_NEW_ENEMY:
             self.spawn_enemy(event.args["enemy_config"])
             return True
+        elif event.event_name == Constants.EVENT_TILE_CHANGED:
+            self.update_goal_paths(event.args["tile"])
+            return True
         return False
 
 
     def spawn_enemy(self, enemy_config):
-        wave_number = enemy_config["wave"]
         hp = enemy_config["hp"]
         move_speed = enemy_config["speed"]
-        reward = enemy_config["reward"]
 
         hp_variation = int(hp / 10) # ensure only slight difference in speed
         variable_hp = get_variable_int(int(hp), hp_variation)
@@ -47,31 +79,64 @@ class EnemySpawner:
 
         self.spawn_id += 1
         enemy = Enemy(
-            self.tile_manager,
-            self.map_config,
-            self.start_tile_index,
-            self.goal_tile_index,
+            self.enemy_context,
+            ENEMY_ARCHETYPES[enemy_config["wave"]],
+            self.enemy_store,
+            self.enemies.get_next_handle(),
             variable_hp,
             variable_move_speed,
             f"id-{self.spawn_id}",
-            wave_number,
-            reward)
-        self.enemies.append(enemy)
+            spawn_order=self.spawn_id)
+        self.enemies.insert(enemy)
 
 
-    def raise_place_notification(self):
+    def get_enemy(self, handle: Handle) -> Enemy | None:
+        """
+        Returns:
+            The enemy of the handle, or None once it died or escaped.
+        """
+        return self.enemies.get(handle)
+
+
+    def update_goal_paths(self, changed_tile: Tile):
+        if self.flow_field is not None:
+            changed_indexes = update_flow_field(self.flow_field, changed_tile)
+        else:
+            # NOTE: paths that don't cross the changed tile stay valid, only possibly longer once it opens
+            changed_indexes = {(changed_tile.index.x, changed_tile.index.y)}
+        if not changed_indexes:
+            return
+
+        # NOTE: a path that doesn't cross a changed tile still descends the field one step at a time
         for enemy in self.enemies:
-            enemy.calculate_goal_path()
+            remaining_goal_path = enemy.get_remaining_goal_path()
+            if not remaining_goal_path or any(index in changed_indexes for index in remaining_goal_path):
+                enemy.calculate_goal_path()
 
 
     def update(self, dt, ):
-        # NOTE: loop a copy of enemies, delete from enemies
-        for enemy in self.enemies[:]:
-            enemy.update(dt)
-
-            if not enemy.alive():
-                self.enemies.remove(enemy)
-                GlobalEventDispatcher.dispatch(Event(Constants.EVENT_ENEMY_PROCESSED))
+        # Waypoints, movement and tile crossings of every enemy in a few array operations
+        for slot in self.enemy_store.get_target_reached_slots().tolist():
+            self.enemy_store.owners[slot].update_move_target()
+        moved_slots = self.enemy_store.move(dt)
+        for slot, tile_index in self.enemy_store.get_tile_changes(moved_slots):
+            self.enemy_store.owners[slot].update_occupied_tile(tile_index)
+
+        # Per enemy work only for the enemies the arrays single out
+        owners = self.enemy_store.owners
+        for slot in self.enemy_store.get_dead_slots().tolist():
+            owners[slot].update_death()
+        for slot, sprite_direction in self.enemy_store.get_sprite_direction_changes():
+            owners[slot].update_sprite_direction(sprite_direction)
+        for slot in self.enemy_store.get_frozen_slots().tolist():
+            owners[slot].emit_freeze_particles()
+
+        for slot in self.enemy_store.get_finished_slots().tolist():
+            enemy = owners[slot]
+            enemy.release()
+            self.enemies.remove(enemy.handle)
+            GlobalEventDispatcher.dispatch(Event(Constants.EVENT_ENEMY_PROCESSED))
+        self.enemy_store.update_freeze_timers(dt)
 
 
     def draw(self, renderer: Renderer):
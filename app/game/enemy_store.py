@@ -0,0 +1,238 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from constants import Constants
+from game.isometric import screens_to_tiles
+
+
+HALF_SPRITE_WIDTH = Constants.SPRITE_ENEMY_RENDER_WIDTH // 2
+HALF_SPRITE_HEIGHT = Constants.SPRITE_ENEMY_RENDER_HEIGHT // 2
+SPRITE_THIRD = Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3
+NO_TILE = -1
+NO_SPRITE = -1
+SPRITE_LEFT = 0
+SPRITE_RIGHT = 1
+SPRITE_DOWN = 2
+SPRITE_UP = 3
+STATE_ARRAYS = ["position", "target", "direction", "bounds", "tile", "move_speed", "hp", "spawn_order", "sprite_direction", "freeze_elapsed", "is_freeze", "target_reached", "active"]
+
+
+@dataclass(slots=True)
+class EnemyTargetState:
+    """
+    Plain Python copies of the store state read by tower targeting, indexed by slot.
+    """
+    alive: list[bool]
+    hp: list[int]
+    center_x: list[float] # Sprite centers, the point towers aim at
+    center_y: list[float]
+
+
+class EnemyStore:
+    """
+    Structure of arrays holding the per frame state of every enemy.
+
+    Each enemy owns a slot in contiguous NumPy arrays, Enemy is a thin view reading its
+    slot. Waypoint checks, movement, derived bounds, tile crossings, sprite directions
+    and freeze timers run for all enemies at once. Per frame consumers (targeting,
+    bullet hits, the spawner) read the arrays in batch, the Enemy view properties are
+    meant for events and rendering.
+    """
+    def __init__(self, capacity: int = 64):
+        self.capacity = 0
+        self.free_slots: list[int] = []
+        self.owners: list = []
+        self.position = np.zeros((0, 2), dtype=np.float64)
+        self.target = np.zeros((0, 2), dtype=np.float64)
+        self.direction = np.zeros((0, 2), dtype=np.float64)
+        self.bounds = np.zeros((0, 2), dtype=np.int64) # Top left of the render bounds, truncated like pygame.Rect
+        self.tile = np.zeros((0, 2), dtype=np.int64)
+        self.move_speed = np.zeros(0, dtype=np.float64)
+        self.hp = np.zeros(0, dtype=np.int64)
+        self.spawn_order = np.zeros(0, dtype=np.int64)
+        self.sprite_direction = np.zeros(0, dtype=np.int8)
+        self.freeze_elapsed = np.zeros(0, dtype=np.float64)
+        self.is_freeze = np.zeros(0, dtype=bool)
+        self.target_reached = np.zeros(0, dtype=bool)
+        self.active = np.zeros(0, dtype=bool)
+        self._grow(capacity)
+
+
+    def _grow(self, capacity: int):
+        added = capacity - self.capacity
+        for name in STATE_ARRAYS:
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.zeros((added,) + array.shape[1:], dtype=array.dtype)]))
+        self.owners.extend([None] * added)
+        self.free_slots.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+
+
+    def allocate(self, owner, x: float, y: float, hp: int, move_speed: float, spawn_order: int = 0) -> int:
+        if not self.free_slots:
+            self._grow(self.capacity * 2)
+        slot = self.free_slots.pop()
+        self.owners[slot] = owner
+        self.position[slot] = (x, y)
+        self.target[slot] = (x, y)
+        self.direction[slot] = (0, 0)
+        self.bounds[slot] = (int(x), int(y))
+        self.tile[slot] = (NO_TILE, NO_TILE)
+        self.move_speed[slot] = move_speed
+        self.hp[slot] = hp
+        self.spawn_order[slot] = spawn_order
+        self.sprite_direction[slot] = NO_SPRITE
+        self.freeze_elapsed[slot] = 0
+        self.is_freeze[slot] = False
+        self.target_reached[slot] = False
+        self.active[slot] = True
+        return slot
+
+
+    def free(self, slot: int):
+        self.active[slot] = False
+        self.owners[slot] = None
+        self.free_slots.append(slot)
+
+
+    def detach(self, slot: int) -> "EnemyStore":
+        """
+        Free the slot and keep a copy of its last state.
+
+        Returns:
+            Store holding the inactive copy in slot 0, outside of the batched updates.
+        """
+        detached = EnemyStore(1)
+        detached.free_slots.clear()
+        for name in STATE_ARRAYS:
+            getattr(detached, name)[0] = getattr(self, name)[slot]
+        detached.active[0] = False
+        self.free(slot)
+        return detached
+
+
+    def get_alive(self) -> np.ndarray:
+        return self.active & (self.hp > 0) & ~self.target_reached
+
+
+    def get_living_slots(self) -> np.ndarray:
+        """
+        Returns:
+            Slots of the living enemies in spawn order.
+        """
+        slots = np.flatnonzero(self.get_alive())
+        return slots[np.argsort(self.spawn_order[slots], kind="stable")]
+
+
+    def get_dead_slots(self) -> np.ndarray:
+        return np.flatnonzero(self.active & (self.hp <= 0))
+
+
+    def get_finished_slots(self) -> np.ndarray:
+        """
+        Returns:
+            Slots of the dead and escaped enemies, ready to be released.
+        """
+        return np.flatnonzero(self.active & ((self.hp <= 0) | self.target_reached))
+
+
+    def get_sprite_centers(self, slots: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # Same arithmetic as Enemy.sprite_center, pygame.Rect centers round down
+        center_x = self.bounds[slots, 0] + HALF_SPRITE_WIDTH
+        center_y = (self.bounds[slots, 1] + HALF_SPRITE_HEIGHT) - SPRITE_THIRD * 2
+        return center_x.astype(np.float64), center_y
+
+
+    def get_collision_origins(self, slots: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Top left corners of Enemy.collision_bounds, the size is the render size.
+        """
+        foot_y = (self.bounds[slots, 1] + HALF_SPRITE_HEIGHT) - SPRITE_THIRD
+        return self.bounds[slots, 0], np.trunc(foot_y - SPRITE_THIRD * 2).astype(np.int64)
+
+
+    def get_target_state(self) -> EnemyTargetState:
+        center_x, center_y = self.get_sprite_centers(slice(None))
+        return EnemyTargetState(self.get_alive().tolist(), self.hp.tolist(), center_x.tolist(), center_y.tolist())
+
+
+    def get_sprite_direction_changes(self) -> list[tuple[int, int]]:
+        """
+        Sprite facing of the living enemies from their move direction, diagonal only.
+
+        Returns:
+            List of (slot, SPRITE_*) for the enemies whose facing changed.
+        """
+        x = self.direction[:, 0]
+        y = self.direction[:, 1]
+        facing = np.select(
+            [(x < 0) & (y < 0), (x > 0) & (y > 0), (x < 0) & (y > 0), (x > 0) & (y < 0)],
+            [SPRITE_LEFT, SPRITE_RIGHT, SPRITE_DOWN, SPRITE_UP],
+            NO_SPRITE)
+        changed = np.flatnonzero(self.get_alive() & (facing != NO_SPRITE) & (facing != self.sprite_direction))
+        self.sprite_direction[changed] = facing[changed]
+        return list(zip(changed.tolist(), facing[changed].tolist()))
+
+
+    def get_frozen_slots(self) -> np.ndarray:
+        return np.flatnonzero(self.get_alive() & self.is_freeze)
+
+
+    def get_target_reached_slots(self) -> np.ndarray:
+        offsets = self.target - self.position
+        distances = np.sqrt(offsets[:, 0] * offsets[:, 0] + offsets[:, 1] * offsets[:, 1])
+        return np.flatnonzero(self.get_alive() & (distances <= Constants.ENEMY_REACHED_DISTANCE))
+
+
+    def move(self, dt: float) -> np.ndarray:
+        """
+        Step every living enemy towards its target and refresh the derived bounds.
+
+        Returns:
+            Slots of the enemies that moved.
+        """
+        alive = self.get_alive()
+        self.direction[alive] = self.target[alive] - self.position[alive]
+        direction = self.direction
+        moved = np.flatnonzero(alive & ((direction[:, 0] != 0) | (direction[:, 1] != 0)))
+        if moved.size == 0:
+            return moved
+
+        offsets = direction[moved]
+        lengths = np.sqrt(offsets[:, 0] * offsets[:, 0] + offsets[:, 1] * offsets[:, 1])
+        move_speeds = self.move_speed[moved] * dt
+        # Slow down move speed "freeze"
+        move_speeds = np.where(self.is_freeze[moved], move_speeds - move_speeds / Constants.TOWER_FREEZE_SPEED_REDUCTION_DIVISION, move_speeds)
+        self.position[moved, 0] += offsets[:, 0] / lengths * move_speeds
+        self.position[moved, 1] += offsets[:, 1] / lengths * move_speeds
+        self.bounds[moved] = np.trunc(self.position[moved])
+        return moved
+
+
+    def get_tile_changes(self, slots: np.ndarray) -> list[tuple[int, tuple[int, int] | None]]:
+        """
+        Tiles under the foot of the given enemies, for the ones that crossed a tile edge.
+
+        Returns:
+            List of (slot, (col, row) or None) for the enemies whose tile changed.
+        """
+        cols, rows, inside = screens_to_tiles(
+            self.bounds[slots, 0] + HALF_SPRITE_WIDTH,
+            self.bounds[slots, 1] + HALF_SPRITE_HEIGHT - SPRITE_THIRD)
+        cols = np.where(inside, cols, NO_TILE)
+        rows = np.where(inside, rows, NO_TILE)
+        changed = (cols != self.tile[slots, 0]) | (rows != self.tile[slots, 1])
+
+        tile_changes = []
+        for slot, col, row in zip(slots[changed].tolist(), cols[changed].tolist(), rows[changed].tolist()):
+            tile_changes.append((slot, (col, row) if col != NO_TILE else None))
+        return tile_changes
+
+
+    def update_freeze_timers(self, dt: float):
+        frozen = self.get_alive() & self.is_freeze
+        self.freeze_elapsed[frozen] += 1 * dt
+        thawed = frozen & (self.freeze_elapsed >= Constants.TOWER_FREEZE_TICK)
+        self.freeze_elapsed[thawed] = 0
+        self.is_freeze[thawed] = False
@@ -28,12 +28,13 @@ class EnergyManager:
 
     def on_event(self, event: Event) -> bool:
         if event.event_name == Constants.EVENT_ENEMY_DIED:
-            enemy = event.args["enemy"]
-            print(f"reward: +{enemy.reward} pos: {enemy.position.copy()}")
+            reward = event.args["reward"]
+            position = event.args["position"]
+            print(f"reward: +{reward} pos: {position.copy()}")
             GlobalEventDispatcher.dispatch(Event(
                 Constants.EVENT_ADD_COMBAT_TEXT,
-                { "combat_text": get_combat_text(CombatTextType.ENERGY_ADD, f"+{enemy.reward}", enemy.position.copy()) }))
-            self.energy += enemy.reward
+                { "combat_text": get_combat_text(CombatTextType.ENERGY_ADD, f"+{reward}", position.copy()) }))
+            self.energy += reward
             return True
         return False
 
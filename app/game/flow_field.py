@@ -0,0 +1,212 @@
+from collections import deque
+from dataclasses import dataclass, field
+import heapq
+
+from custom_types.int_vector2 import IntVector2
+from constants import Constants
+from game.collision_grid import CollisionGrid
+from game.tile_graph import TileGraph
+from game.wavefront import wavefront_distances
+
+
+UNREACHABLE = -1
+
+
+@dataclass
+class FlowField:
+    """
+    Distance field towards a single goal tile, shared by all enemies.
+
+    A reverse breadth first search from the goal stores the step count to the goal
+    for every walkable tile, enemies then walk the field downhill instead of running
+    their own A* search. Recomputing it only depends on the map size, large maps
+    expand the search with NumPy.
+    """
+    goal_index: IntVector2
+    distances: list[int] = field(default_factory=list)
+    cells: bytearray = field(default_factory=bytearray)
+    tile_graph: TileGraph | None = field(default=None)
+
+
+    def compute(self, grid: CollisionGrid):
+        """
+        Rebuild the distance field.
+
+        Args:
+            grid: CollisionGrid where 0 = walkable, 1 = blocked (obstacle), its TileGraph provides the neighbors.
+        """
+        tile_graph = grid.tile_graph
+        neighbors = tile_graph.neighbors
+        cells = bytearray(grid.cells)
+        self.tile_graph = tile_graph
+        self.cells = cells
+        if tile_graph.tile_count >= Constants.PATH_WAVEFRONT_MIN_TILES:
+            self.distances = wavefront_distances(grid, self.goal_index.x, self.goal_index.y)
+            return
+
+        distances = [UNREACHABLE] * tile_graph.tile_count
+        self.distances = distances
+
+        goal_id = tile_graph.get_id(self.goal_index.x, self.goal_index.y)
+        if cells[goal_id] != 0:
+            return
+
+        distances[goal_id] = 0
+        queue = deque([goal_id])
+        while queue:
+            current = queue.popleft()
+            next_distance = distances[current] + 1
+            for neighbor in neighbors[current]:
+                if cells[neighbor] == 0 and distances[neighbor] == UNREACHABLE:
+                    distances[neighbor] = next_distance
+                    queue.append(neighbor)
+
+
+    def _has_support(self, tile_id: int) -> bool:
+        distance = self.distances[tile_id]
+        for neighbor in self.tile_graph.neighbors[tile_id]:
+            if self.cells[neighbor] == 0 and self.distances[neighbor] == distance - 1:
+                return True
+        return False
+
+
+    def set_blocked(self, x: int, y: int, blocked: bool) -> set[tuple[int, int]]:
+        """
+        Incrementally repair the field after a single tile changed walkability.
+
+        Only tiles whose distance depended on the changed tile are touched, so the cost
+        scales with the size of the change instead of the size of the map.
+
+        Returns:
+            Set of (x, y) tuples whose distance changed.
+        """
+        tile_id = self.tile_graph.get_id(x, y)
+        value = 1 if blocked else 0
+        if self.cells[tile_id] == value:
+            return set()
+
+        self.cells[tile_id] = value
+        if blocked:
+            changed = self._repair_blocked(tile_id)
+        else:
+            changed = self._repair_unblocked(tile_id)
+        return {self.tile_graph.get_index(changed_id) for changed_id in changed}
+
+
+    def _repair_blocked(self, tile_id: int) -> set[int]:
+        cells = self.cells
+        distances = self.distances
+        neighbors = self.tile_graph.neighbors
+        if distances[tile_id] == UNREACHABLE:
+            return set()
+
+        # Invalidate every tile that lost all of its neighbors one step closer to the goal
+        changed = {tile_id}
+        queue = deque([(tile_id, distances[tile_id])])
+        distances[tile_id] = UNREACHABLE
+        while queue:
+            current, distance = queue.popleft()
+            for neighbor in neighbors[current]:
+                if cells[neighbor] != 0 or distances[neighbor] != distance + 1:
+                    continue
+                if not self._has_support(neighbor):
+                    distances[neighbor] = UNREACHABLE
+                    changed.add(neighbor)
+                    queue.append((neighbor, distance + 1))
+
+        # Seed the invalidated tiles from their valid border and relax inwards
+        open_set = []
+        for current in changed:
+            if cells[current] != 0:
+                continue
+            for neighbor in neighbors[current]:
+                if cells[neighbor] == 0 and distances[neighbor] != UNREACHABLE:
+                    heapq.heappush(open_set, (distances[neighbor] + 1, current))
+
+        while open_set:
+            distance, current = heapq.heappop(open_set)
+            if distances[current] != UNREACHABLE and distances[current] <= distance:
+                continue
+            distances[current] = distance
+            for neighbor in neighbors[current]:
+                if cells[neighbor] != 0:
+                    continue
+                if distances[neighbor] == UNREACHABLE or distances[neighbor] > distance + 1:
+                    heapq.heappush(open_set, (distance + 1, neighbor))
+
+        return changed
+
+
+    def _repair_unblocked(self, tile_id: int) -> set[int]:
+        cells = self.cells
+        distances = self.distances
+        neighbors = self.tile_graph.neighbors
+        if tile_id == self.tile_graph.get_id(self.goal_index.x, self.goal_index.y):
+            distance = 0
+        else:
+            neighbor_distances = [distances[neighbor] for neighbor in neighbors[tile_id]
+                if cells[neighbor] == 0 and distances[neighbor] != UNREACHABLE]
+            if not neighbor_distances:
+                return set()
+            distance = min(neighbor_distances) + 1
+
+        # A single opened tile can only shorten distances, spread the improvement outwards
+        changed = {tile_id}
+        distances[tile_id] = distance
+        queue = deque([tile_id])
+        while queue:
+            current = queue.popleft()
+            next_distance = distances[current] + 1
+            for neighbor in neighbors[current]:
+                if cells[neighbor] != 0:
+                    continue
+                if distances[neighbor] == UNREACHABLE or distances[neighbor] > next_distance:
+                    distances[neighbor] = next_distance
+                    changed.add(neighbor)
+                    queue.append(neighbor)
+        return changed
+
+
+    def get_distance(self, x: int, y: int) -> int:
+        return self.distances[self.tile_graph.get_id(x, y)]
+
+
+    def _get_next_step(self, tile_id: int, distance: int) -> int | None:
+        # Prefer the neighbor one step closer, any reachable neighbor works when
+        # starting from a blocked tile (e.g. a flower placed under the enemy)
+        best_step = None
+        best_distance = UNREACHABLE
+        for neighbor in self.tile_graph.neighbors[tile_id]:
+            neighbor_distance = self.distances[neighbor]
+            if neighbor_distance == UNREACHABLE:
+                continue
+            if neighbor_distance == distance - 1:
+                return neighbor
+            if best_distance == UNREACHABLE or neighbor_distance < best_distance:
+                best_step = neighbor
+                best_distance = neighbor_distance
+        return best_step
+
+
+    def get_path(self, start_index: IntVector2) -> list[tuple[int, int]]:
+        """
+        Follow the field from start to goal.
+
+        Returns:
+            List of (x, y) tuples including start and goal, or an empty list if the goal can't be reached.
+        """
+        tile_id = self.tile_graph.get_id(start_index.x, start_index.y)
+        path = [self.tile_graph.get_index(tile_id)]
+        distance = self.distances[tile_id]
+        if distance == UNREACHABLE:
+            tile_id = self._get_next_step(tile_id, distance)
+            if tile_id is None:
+                return []
+            path.append(self.tile_graph.get_index(tile_id))
+            distance = self.distances[tile_id]
+
+        while distance > 0:
+            tile_id = self._get_next_step(tile_id, distance)
+            path.append(self.tile_graph.get_index(tile_id))
+            distance -= 1
+        return path
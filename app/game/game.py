@@ -1,4 +1,3 @@
-import math
 from particle_engine import ParticleEngine
 from game.tile import Tile
 from game.button_manager import ButtonManager
@@ -11,12 +10,16 @@ from state_manager import StateManager
 from utils.random_helper import get_variable_int
 from game.combat_text import CombatTextEngine, CombatTextType
 from game.map_generator import MapGenerator
-from game.goal_path_helper import get_collision_grid, get_goal_path
+from game.goal_path_helper import get_collision_grid
+from game.blocking_index import BlockingIndex
+from game.isometric import screen_to_tile
+from game.targeting import CandidateTargeting, SpatialHashTargeting, TargetingEngine, VectorizedTargeting
 from renderer import Renderer, RendererType
 from game.enemy_spawner import EnemySpawner
-from game.bullet_manager import Bullet, BulletManager
+from game.bullet_manager import BulletConfig, BulletManager
 from game.tower import Tower, TowerConfig
 from game.enemy import Enemy
+from game.enemy_store import EnemyTargetState
 from game.background_manager import BackgroundManager
 from game.energy_manager import EnergyManager
 from custom_types.int_vector2 import IntVector2
@@ -38,6 +41,10 @@ class Game(State):
         self.mouse_over_tile_map = False
         self.selector_index = IntVector2()
         self.tile_manager = TileManager(self.map_generator.map_config)
+        self.blocking_index = BlockingIndex(
+            self.map_generator.map_config.start_quadrant.main_index,
+            self.map_generator.map_config.end_quadrant.main_index)
+        self.blocking_index.update(get_collision_grid(self.tile_manager))
 
         self.button_manager = ButtonManager()
         self.combat_text_engine = CombatTextEngine()
@@ -53,6 +60,10 @@ class Game(State):
             self.map_generator.map_config,
             self.map_generator.map_config.start_quadrant.main_index,
             self.map_generator.map_config.end_quadrant.main_index)
+        self.targeting_engine = TargetingEngine(Constants.TOWER_TARGETING_ENGINE)
+        self.vectorized_targeting = VectorizedTargeting() if self.targeting_engine == TargetingEngine.VECTORIZED else None
+        self.candidate_targeting = CandidateTargeting(self.enemy_spawner.get_enemy) if self.targeting_engine == TargetingEngine.CANDIDATES else None
+        self.spatial_hash_targeting = SpatialHashTargeting() if self.targeting_engine == TargetingEngine.SPATIAL_HASH else None
         self.spawner = Spawner()
         self.game_over = False
         self.is_restarted = False
@@ -95,55 +106,69 @@ class Game(State):
             raise Exception(f"no such button type {name}")
 
         tower_config = TowerConfig(name, image, shoot_rate, range)
-        self.towers.append(Tower(tile, tower_config))
+        tower = Tower(tile, tower_config)
+        self.towers.append(tower)
+        if self.vectorized_targeting is not None:
+            self.vectorized_targeting.add_tower(tower)
+        if self.candidate_targeting is not None:
+            self.candidate_targeting.add_tower(tower, self.tile_manager.occupants)
+        if self.spatial_hash_targeting is not None:
+            self.spatial_hash_targeting.add_tower(tower)
 
 
     def place(self, selected_button: BaseButton):
         tile = self.tile_manager.tiles[self.selector_index.y][self.selector_index.x]
         object_value = Constants.LAYER_PLACED_VALUES[selected_button.name]
-        proposed_collision_grid = get_collision_grid(self.tile_manager)
-        proposed_collision_grid[self.selector_index.x][self.selector_index.y] = 1 # 1 is a collision
-        blocks_goal_path = len(get_goal_path(
-            self.tile_manager,
-            self.map_generator.map_config.start_quadrant.main_index,
-            self.map_generator.map_config.end_quadrant.main_index,
-            proposed_collision_grid)) <= 0
+        self.blocking_index.update(get_collision_grid(self.tile_manager))
+        blocks_goal_path = self.blocking_index.blocks_goal_path(self.selector_index.x, self.selector_index.y)
         can_place = tile.can_place()
         energy_value = selected_button.get_cost()
 
         if not blocks_goal_path and can_place and self.energy_manager.energy >= energy_value:
-            tile.set_placed_layer_value(object_value)
+            self.tile_manager.set_placed_layer_value(tile, object_value)
             self.place_tower(tile, selected_button.name)
             selected_button.set_selection(False)
             self.energy_manager.reduce_energy(energy_value)
             GlobalEventDispatcher.dispatch(Event(
                 Constants.EVENT_ADD_COMBAT_TEXT,
                 { "combat_text": get_combat_text(CombatTextType.DAMAGE, f"-{energy_value}", tile.position.copy()) }))
-            self.enemy_spawner.raise_place_notification()
 
 
-    def find_weakest_in_range(self, from_pos: pygame.Vector2, range: float) -> Enemy | None:
+    def find_weakest_in_range(self, tower: Tower, target_state: EnemyTargetState) -> Enemy | None:
         matching_enemy = None
-        weakest_hp = math.inf
-        living_enemies = [enemy for enemy in self.enemy_spawner.enemies if enemy.alive()]
-        for enemy in living_enemies:
-            distance = from_pos.distance_to(enemy.sprite_center)
-            if distance <= range:
-                if enemy._hp < weakest_hp:
+        matching_key = None
+        alive = target_state.alive
+        hps = target_state.hp
+        center_xs = target_state.center_x
+        center_ys = target_state.center_y
+        tower_x = tower.center.x
+        tower_y = tower.center.y
+        range_squared = tower.config.range * tower.config.range
+        for col, row in tower.coverage_tiles:
+            for enemy in self.tile_manager.occupants[row][col]:
+                slot = enemy.slot
+                if not alive[slot]:
+                    continue
+                offset_x = center_xs[slot] - tower_x
+                offset_y = center_ys[slot] - tower_y
+                if offset_x * offset_x + offset_y * offset_y > range_squared:
+                    continue
+                key = (hps[slot], enemy.spawn_order)
+                if matching_key is None or key < matching_key:
                     matching_enemy = enemy
+                    matching_key = key
         return matching_enemy
 
 
     def update_selector(self, mouse_x, mouse_y):
         self.mouse_over_tile_map = False
-        for row in range(Constants.ROW_COUNT):
-            for col in range(Constants.COLUMN_COUNT):
-                tile = self.tile_manager.tiles[row][col]
-                if tile.contains_point(mouse_x, mouse_y):
-                    self.mouse_over_tile_map = True
-                    self.selector_index = tile.index
-                    self.selector_tile_pos = self.tile_manager.tiles[self.selector_index.y][self.selector_index.x].position
-                    return
+        tile_index = screen_to_tile(mouse_x, mouse_y)
+        if tile_index is not None:
+            col, row = tile_index
+            tile = self.tile_manager.tiles[row][col]
+            self.mouse_over_tile_map = True
+            self.selector_index = tile.index
+            self.selector_tile_pos = tile.position
 
 
     def update_buttons(self, dt):
@@ -161,28 +186,42 @@ class Game(State):
 
 
     def update_towers(self, dt):
-        for tower in self.towers:
-            target_enemy = self.find_weakest_in_range(tower.center, tower.config.range)
+        enemy_store = self.enemy_spawner.enemy_store
+        target_state = enemy_store.get_target_state()
+        if self.vectorized_targeting is not None:
+            target_enemies = self.vectorized_targeting.get_targets(enemy_store)
+        elif self.candidate_targeting is not None:
+            target_enemies = self.candidate_targeting.get_targets(target_state)
+        elif self.spatial_hash_targeting is not None:
+            target_enemies = self.spatial_hash_targeting.get_targets(enemy_store)
+        else:
+            target_enemies = [self.find_weakest_in_range(tower, target_state) for tower in self.towers]
+
+        for tower, target_enemy in zip(self.towers, target_enemies):
             if target_enemy is not None:
-                tower.set_shoot_target(target_enemy.sprite_center.copy())
+                slot = target_enemy.slot
+                tower.set_shoot_target(pygame.Vector2(target_state.center_x[slot], target_state.center_y[slot]))
             else:
                 tower.cancel_target()
             tower.update(dt)
 
 
-    def update_bullet_hit(self, enemy: Enemy, colliding_bullet: Bullet):
-        damage_variation = int(colliding_bullet.bullet_config["damage"] / 2)
-        damage = get_variable_int(colliding_bullet.bullet_config["damage"], damage_variation)
-        enemy.apply_damage(damage, colliding_bullet.bullet_config["effect"])
+    def update_bullet_hit(self, enemy: Enemy, bullet_config: BulletConfig):
+        damage_variation = int(bullet_config.damage / 2)
+        damage = get_variable_int(bullet_config.damage, damage_variation)
+        enemy.apply_damage(damage, bullet_config.effect)
 
 
     def update_bullet_collisions(self, dt):
         self.bullet_manager.update(dt)
-        living_enemies = [enemy for enemy in self.enemy_spawner.enemies if enemy.alive()]
-        for enemy in living_enemies:
-            colliding_bullet = self.bullet_manager.get_collisions(enemy.collision_bounds)
+        enemy_store = self.enemy_spawner.enemy_store
+        living_slots = enemy_store.get_living_slots()
+        lefts, tops = enemy_store.get_collision_origins(living_slots)
+        colliding_bullets = self.bullet_manager.get_all_collisions(
+            lefts, tops, Constants.SPRITE_ENEMY_RENDER_WIDTH, Constants.SPRITE_ENEMY_RENDER_HEIGHT)
+        for slot, colliding_bullet in zip(living_slots.tolist(), colliding_bullets):
             if colliding_bullet is not None:
-                self.update_bullet_hit(enemy, colliding_bullet)
+                self.update_bullet_hit(enemy_store.owners[slot], colliding_bullet)
 
 
     def update(self, dt):
@@ -220,19 +259,14 @@ class Game(State):
                 (mouse_x - Constants.TILE_WIDTH / 2, mouse_y - Constants.TILE_HEIGHT / 2))
         elif self.mouse_over_tile_map:
             tile = self.tile_manager.tiles[self.selector_index.y][self.selector_index.x]
-            proposed_collision_grid = get_collision_grid(self.tile_manager)
-            proposed_collision_grid[self.selector_index.x][self.selector_index.y] = 1 # 1 is a collision
+            self.blocking_index.update(get_collision_grid(self.tile_manager))
             if not tile.can_place():
                 renderer.request_polygon_draw(
                     RendererType.CANT_PlACE,
                     "red",
                     tile.tile_points,
                     0)
-            elif len(get_goal_path(
-                    self.tile_manager,
-                    self.map_generator.map_config.start_quadrant.main_index,
-                    self.map_generator.map_config.end_quadrant.main_index,
-                    proposed_collision_grid)) <= 0:
+            elif self.blocking_index.blocks_goal_path(self.selector_index.x, self.selector_index.y):
                         renderer.request_polygon_draw(
                         RendererType.CANT_PlACE,
                         "orange",
@@ -263,9 +297,8 @@ class Game(State):
 
         screen.fill("skyblue")
         self.background_manager.draw(screen)
-        self.tile_manager.draw_floor_layer(renderer)
+        self.tile_manager.draw_static_layer(renderer)
         self.tile_manager.draw_selector(renderer, self.selector_index.y, self.selector_index.x)
-        self.tile_manager.draw_fence(renderer)
 
         for tower in self.towers:
             tower.draw(renderer)
@@ -1,21 +1,98 @@
+from dataclasses import dataclass, field
+from enum import Enum
+
 from custom_types.int_vector2 import IntVector2
 from game.astar import astar
+from game.bucket_path import dial_path
+from game.flow_field import FlowField
+from game.collision_grid import CollisionGrid
+from game.hierarchical_path import HierarchicalPathfinder
 from constants import Constants
+from game.tile import Tile
 from game.tile_manager import TileManager
 
 
-def get_collision_grid(tile_manager: TileManager) -> list[list[int]]:
-    grid = [[0 if tile_manager.tiles[row][col].can_place() else 1
-            for row in range(Constants.ROW_COUNT)]
-                for col in range(Constants.COLUMN_COUNT)]
-    return grid
+class PathEngine(Enum):
+    ASTAR = "astar"
+    BUCKET = "bucket" # Dial's algorithm, supports weighted tiles
+    FLOW_FIELD = "flow_field"
+    HIERARCHICAL = "hierarchical" # HPA*, near optimal paths
+
+
+def get_collision_grid(tile_manager: TileManager) -> CollisionGrid:
+    return tile_manager.collision_grid
+
+
+def get_tile_costs(tile_manager: TileManager) -> bytearray:
+    tile_costs = bytearray(Constants.COLUMN_COUNT * Constants.ROW_COUNT)
+    for row in range(Constants.ROW_COUNT):
+        for col in range(Constants.COLUMN_COUNT):
+            floor_value = tile_manager.tiles[row][col].values[Constants.NAME_FLOOR_LAYER]
+            tile_costs[col * Constants.ROW_COUNT + row] = Constants.LAYER_FLOOR_COSTS[floor_value]
+    return tile_costs
 
 
-def get_goal_path(tile_manager: TileManager, start_tile_index: IntVector2, goal_tile_index: IntVector2, grid: list[list[int]] | None = None):
-    collision_grid = (grid if grid else get_collision_grid(tile_manager))
-    goal_path = astar(
-        collision_grid,
-        (start_tile_index.x, start_tile_index.y),
-        (goal_tile_index.x, goal_tile_index.y))
+def get_goal_path(collision_grid: CollisionGrid, start_tile_index: IntVector2, goal_tile_index: IntVector2, engine: PathEngine = PathEngine.ASTAR, tile_costs: bytearray | None = None):
+    start = (start_tile_index.x, start_tile_index.y)
+    goal = (goal_tile_index.x, goal_tile_index.y)
 
+    if engine == PathEngine.BUCKET:
+        return dial_path(collision_grid, start, goal, tile_costs)
+
+    goal_path = astar(collision_grid, start, goal)
     return goal_path
+
+
+def get_flow_field(tile_manager: TileManager, goal_tile_index: IntVector2, grid: CollisionGrid | None = None) -> FlowField:
+    collision_grid = (grid if grid is not None else get_collision_grid(tile_manager))
+    flow_field = FlowField(goal_tile_index)
+    flow_field.compute(collision_grid)
+    return flow_field
+
+
+def get_hierarchical_pathfinder(tile_manager: TileManager) -> HierarchicalPathfinder:
+    return HierarchicalPathfinder(get_collision_grid(tile_manager), Constants.PATH_CLUSTER_SIZE)
+
+
+def update_flow_field(flow_field: FlowField, tile: Tile) -> set[tuple[int, int]]:
+    return flow_field.set_blocked(tile.index.x, tile.index.y, not tile.can_place())
+
+
+@dataclass
+class GoalPathCache:
+    """
+    Goal paths keyed by (collision grid version, start tile).
+
+    Enemies starting on the same tile share one immutable path tuple, entries from an
+    older grid version are dropped as soon as the grid changes. Misses are resolved
+    by the engine: the flow field, the hierarchical pathfinder or a single A* / Dial's
+    search, the latter weighted by tile_costs.
+    """
+    goal_tile_index: IntVector2
+    collision_grid: CollisionGrid
+    engine: PathEngine = field(default=PathEngine.FLOW_FIELD)
+    flow_field: FlowField | None = field(default=None)
+    hierarchical_pathfinder: HierarchicalPathfinder | None = field(default=None)
+    tile_costs: bytearray | None = field(default=None)
+    paths: dict[tuple[int, int, int], tuple[tuple[int, int], ...]] = field(default_factory=dict)
+    grid_version: int = field(default=-1)
+
+
+    def get_path(self, start_tile_index: IntVector2) -> tuple[tuple[int, int], ...]:
+        if self.collision_grid.version != self.grid_version:
+            self.paths.clear()
+            self.grid_version = self.collision_grid.version
+
+        key = (self.grid_version, start_tile_index.x, start_tile_index.y)
+        path = self.paths.get(key)
+        if path is None:
+            if self.engine == PathEngine.FLOW_FIELD:
+                path = tuple(self.flow_field.get_path(start_tile_index))
+            elif self.engine == PathEngine.HIERARCHICAL:
+                path = tuple(self.hierarchical_pathfinder.get_path(
+                    (start_tile_index.x, start_tile_index.y),
+                    (self.goal_tile_index.x, self.goal_tile_index.y)))
+            else:
+                path = tuple(get_goal_path(self.collision_grid, start_tile_index, self.goal_tile_index, self.engine, self.tile_costs))
+            self.paths[key] = path
+        return path
@@ -0,0 +1,144 @@
+import math
+
+import numpy as np
+
+from constants import Constants
+
+
+HALF_WIDTH = Constants.TILE_RENDER_WIDTH / 2
+HALF_HEIGHT = Constants.TILE_RENDER_HEIGHT / 2
+DEPTH_COUNT = Constants.COLUMN_COUNT + Constants.ROW_COUNT - 1
+
+
+def _to_tile_space(px, py):
+    # Inverse of tile_to_screen for the tile center, works on scalars and arrays.
+    # Diamond centers land on whole numbers, a point is inside the tile whose
+    # center is at most half a tile away on both axes.
+    u = (px - Constants.TILE_OFFSET_X - HALF_WIDTH) / HALF_WIDTH
+    v = (py - Constants.TILE_OFFSET_Y - HALF_HEIGHT) / HALF_HEIGHT
+    return (v + u) / 2, (v - u) / 2
+
+
+def tile_to_screen(col: float, row: float) -> tuple[float, float]:
+    """
+    Top left corner of the tile's render bounds, the same as Tile.position.
+    """
+    return (
+        (col - row) * HALF_WIDTH + Constants.TILE_OFFSET_X,
+        (col + row) * HALF_HEIGHT + Constants.TILE_OFFSET_Y)
+
+
+def get_tile_depth(col: int, row: int) -> int:
+    """
+    Draw order of a tile, from 0 at the top corner of the map to DEPTH_COUNT - 1 at
+    the bottom corner. Tiles further down the screen are drawn later.
+    """
+    return col + row
+
+
+def screen_to_tile(px: float, py: float) -> tuple[int, int] | None:
+    """
+    Tile whose diamond contains the screen point, in constant time.
+
+    Points on the edge between two tiles go to the lower index, matching a row
+    by row scan with Tile.contains_point().
+
+    Returns:
+        (col, row) tuple, or None if the point is outside the map.
+    """
+    col_position, row_position = _to_tile_space(px, py)
+    if not (-0.5 <= col_position <= Constants.COLUMN_COUNT - 0.5 and -0.5 <= row_position <= Constants.ROW_COUNT - 0.5):
+        return None
+    return max(math.ceil(col_position - 0.5), 0), max(math.ceil(row_position - 0.5), 0)
+
+
+def _distance_to_segment(px: float, py: float, ax: float, ay: float, bx: float, by: float) -> float:
+    abx = bx - ax
+    aby = by - ay
+    t = ((px - ax) * abx + (py - ay) * aby) / (abx * abx + aby * aby)
+    t = max(0.0, min(1.0, t))
+    return math.hypot(px - (ax + t * abx), py - (ay + t * aby))
+
+
+def get_tiles_in_circle(x: float, y: float, radius: float) -> list[tuple[int, int]]:
+    """
+    Tiles whose diamond intersects the screen space circle.
+
+    Returns:
+        List of (col, row) tuples.
+    """
+    col_position, row_position = _to_tile_space(x, y)
+    tile_radius = (radius / HALF_WIDTH + radius / HALF_HEIGHT) / 2 + 1
+    min_col = max(math.floor(col_position - tile_radius), 0)
+    max_col = min(math.ceil(col_position + tile_radius), Constants.COLUMN_COUNT - 1)
+    min_row = max(math.floor(row_position - tile_radius), 0)
+    max_row = min(math.ceil(row_position + tile_radius), Constants.ROW_COUNT - 1)
+
+    tiles = []
+    for row in range(min_row, max_row + 1):
+        for col in range(min_col, max_col + 1):
+            left, top = tile_to_screen(col, row)
+            center_x = left + HALF_WIDTH
+            center_y = top + HALF_HEIGHT
+            if abs(x - center_x) / HALF_WIDTH + abs(y - center_y) / HALF_HEIGHT <= 1:
+                tiles.append((col, row))
+                continue
+
+            corners = [
+                (center_x, center_y - HALF_HEIGHT),
+                (center_x - HALF_WIDTH, center_y),
+                (center_x, center_y + HALF_HEIGHT),
+                (center_x + HALF_WIDTH, center_y)]
+            for corner_index, (ax, ay) in enumerate(corners):
+                bx, by = corners[(corner_index + 1) % len(corners)]
+                if _distance_to_segment(x, y, ax, ay, bx, by) <= radius:
+                    tiles.append((col, row))
+                    break
+    return tiles
+
+
+def is_tile_inside_circle(col: int, row: int, x: float, y: float, radius: float) -> bool:
+    """
+    True if the whole diamond of the tile lies inside the screen space circle.
+    """
+    left, top = tile_to_screen(col, row)
+    center_x = left + HALF_WIDTH
+    center_y = top + HALF_HEIGHT
+    corners = [
+        (center_x, center_y - HALF_HEIGHT),
+        (center_x - HALF_WIDTH, center_y),
+        (center_x, center_y + HALF_HEIGHT),
+        (center_x + HALF_WIDTH, center_y)]
+    return all(math.hypot(corner_x - x, corner_y - y) <= radius for corner_x, corner_y in corners)
+
+
+def tiles_to_screen(cols, rows):
+    """
+    Batched tile_to_screen for NumPy arrays of columns and rows.
+
+    Returns:
+        (xs, ys) arrays with the top left corner of each tile.
+    """
+    cols = np.asarray(cols, dtype=np.float64)
+    rows = np.asarray(rows, dtype=np.float64)
+    return (
+        (cols - rows) * HALF_WIDTH + Constants.TILE_OFFSET_X,
+        (cols + rows) * HALF_HEIGHT + Constants.TILE_OFFSET_Y)
+
+
+def screens_to_tiles(xs, ys):
+    """
+    Batched screen_to_tile for NumPy arrays of screen coordinates.
+
+    Returns:
+        (cols, rows, inside) arrays, inside is False where the point is outside the map
+        and the column and row there are meaningless.
+    """
+    col_positions, row_positions = _to_tile_space(
+        np.asarray(xs, dtype=np.float64),
+        np.asarray(ys, dtype=np.float64))
+    inside = ((col_positions >= -0.5) & (col_positions <= Constants.COLUMN_COUNT - 0.5)
+        & (row_positions >= -0.5) & (row_positions <= Constants.ROW_COUNT - 0.5))
+    cols = np.maximum(np.ceil(col_positions - 0.5), 0).astype(np.int64)
+    rows = np.maximum(np.ceil(row_positions - 0.5), 0).astype(np.int64)
+    return cols, rows, inside
@@ -5,6 +5,8 @@ import random
 import copy
 
 from game.map import Map
+from game.tile_graph import TileGraph
+from game.union_find import UnionFind
 from custom_types.int_vector2 import IntVector2
 from constants import Constants
 
@@ -37,6 +39,12 @@ class MapQuadrant:
             random.randint(self.start_index.y, self.start_index.y + self.row_count))
 
 
+    def get_tile_indexes(self) -> list[IntVector2]:
+        return [IntVector2(x, y)
+            for x in range(self.start_index.x, self.start_index.x + self.col_count + 1)
+                for y in range(self.start_index.y, self.start_index.y + self.row_count + 1)]
+
+
 @dataclass
 class MapConfig:
     start_quadrant: MapQuadrant
@@ -91,32 +99,78 @@ class MapGenerator:
         return quadrants
 
 
-    def _apply_random_collisions(self, collision_layer: list[list[int]], quadrant: MapQuadrant, tile_percentage: int = 10):
-        # Calculate 10% of tiles
-        layer = collision_layer.copy()
+    def _get_random_collision_tiles(self, quadrant: MapQuadrant, tile_percentage: int, excluded_tiles: set[int], tile_graph: TileGraph) -> list[int]:
+        """
+        Pick distinct random tiles of the quadrant that aren't excluded yet.
+
+        Returns:
+            List of tile ids in placement order.
+        """
         tiles_in_quadrant = quadrant.col_count * quadrant.row_count
         collision_tile_count = math.ceil(tiles_in_quadrant / 100 * tile_percentage)
 
-        # Get random tile_index
-        tile_indexes = []
-        found_count = 0
-        while found_count < collision_tile_count:
-            tile_index = quadrant.get_random_tile_index()
-            if tile_index.x == quadrant.main_index.x and tile_index.y == quadrant.main_index.y:
-                print("main tile skipped")
-                continue
-            if tile_index not in tile_indexes:
-                tile_indexes.append(tile_index)
-                found_count += 1
-                continue
-            print("something else")
-
-        # Apply random collision directly
-        for tile_index in tile_indexes:
-            collision_value = random.choice([1, 2]) # 1 tall tree, 2 short tree
-            layer[tile_index.y][tile_index.x] = collision_value
-
-        return layer
+        available_tiles = [tile_graph.get_id(tile_index.x, tile_index.y) for tile_index in quadrant.get_tile_indexes()]
+        available_tiles = [tile_id for tile_id in available_tiles if tile_id not in excluded_tiles]
+        return random.sample(available_tiles, min(collision_tile_count, len(available_tiles)))
+
+
+    def _get_path_cut(self, blocked: bytearray, collision_tiles: list[int], start: int, end: int, tile_graph: TileGraph) -> int | None:
+        """
+        Find the first collision tile that disconnects start from end when the tiles are placed in order.
+
+        All tiles are placed at once and the open tiles are joined in a union-find, then
+        the placements are undone from last to first until start and end join. Union-find
+        can only merge, so removing collisions in reverse keeps every step near constant time.
+
+        Returns:
+            Position of the cutting tile in collision_tiles, or None if all tiles fit.
+        """
+        blocked = bytearray(blocked)
+        for tile_id in collision_tiles:
+            blocked[tile_id] = 1
+
+        open_sets = UnionFind(tile_graph.tile_count)
+        for tile_id in range(tile_graph.tile_count):
+            if blocked[tile_id] == 0:
+                for neighbor in tile_graph.neighbors[tile_id]:
+                    if blocked[neighbor] == 0:
+                        open_sets.union(tile_id, neighbor)
+        if open_sets.connected(start, end):
+            return None
+
+        for position in range(len(collision_tiles) - 1, -1, -1):
+            tile_id = collision_tiles[position]
+            blocked[tile_id] = 0
+            for neighbor in tile_graph.neighbors[tile_id]:
+                if blocked[neighbor] == 0:
+                    open_sets.union(tile_id, neighbor)
+            if open_sets.connected(start, end):
+                return position
+
+        raise ValueError("Map layers block every path between start and end")
+
+
+    def _get_connected_collision_tiles(self, collision_layer: list[list[int]], collision_tiles: list[int], start_index: IntVector2, end_index: IntVector2, tile_graph: TileGraph) -> list[int]:
+        """
+        Drop the collision tiles that would cut the path between start and end.
+
+        Tiles are kept greedily in placement order, each pass drops the first cutting tile,
+        so generation takes at most one pass per dropped tile at any tree density.
+        """
+        blocked = bytearray(tile_graph.tile_count)
+        for row in range(tile_graph.row_count):
+            for col in range(tile_graph.col_count):
+                if collision_layer[row][col] != 0:
+                    blocked[tile_graph.get_id(col, row)] = 1
+
+        start = tile_graph.get_id(start_index.x, start_index.y)
+        end = tile_graph.get_id(end_index.x, end_index.y)
+        collision_tiles = list(collision_tiles)
+        while True:
+            cut = self._get_path_cut(blocked, collision_tiles, start, end, tile_graph)
+            if cut is None:
+                return collision_tiles
+            collision_tiles.pop(cut)
 
 
     def _get_random_map_config(self):
@@ -166,11 +220,28 @@ class MapGenerator:
 
     def _get_collision_layer(self, start_quadrant: MapQuadrant, end_quadrant: MapQuadrant, remaining_quadrant_1: MapQuadrant, remaining_quadrant_2: MapQuadrant) -> list[list[int]]:
         collision_layer = copy.deepcopy(Map.COLLISION_LAYER)
-        collision_layer = self._apply_random_collisions(collision_layer, start_quadrant, 5)
-        collision_layer = self._apply_random_collisions(collision_layer, end_quadrant, 5)
-        collision_layer = self._apply_random_collisions(collision_layer, remaining_quadrant_1, random.randint(5, 15))
-        collision_layer = self._apply_random_collisions(collision_layer, remaining_quadrant_2, random.randint(5, 15))
-
-        # TODO: There is a possibility of blocking the goal path
-        #       We can calculate if one still exists, and if not recalculate the collisions
+        tile_graph = TileGraph(Constants.COLUMN_COUNT, Constants.ROW_COUNT)
+        quadrants = [start_quadrant, end_quadrant, remaining_quadrant_1, remaining_quadrant_2]
+        excluded_tiles = {tile_graph.get_id(quadrant.main_index.x, quadrant.main_index.y) for quadrant in quadrants}
+
+        collision_tiles = []
+        for quadrant, tile_percentage in [
+            (start_quadrant, 5),
+            (end_quadrant, 5),
+            (remaining_quadrant_1, random.randint(5, 15)),
+            (remaining_quadrant_2, random.randint(5, 15))]:
+            quadrant_tiles = self._get_random_collision_tiles(quadrant, tile_percentage, excluded_tiles, tile_graph)
+            excluded_tiles.update(quadrant_tiles)
+            collision_tiles += quadrant_tiles
+
+        collision_tiles = self._get_connected_collision_tiles(
+            collision_layer,
+            collision_tiles,
+            start_quadrant.main_index,
+            end_quadrant.main_index,
+            tile_graph)
+
+        for tile_id in collision_tiles:
+            col, row = tile_graph.get_index(tile_id)
+            collision_layer[row][col] = random.choice([1, 2]) # 1 tall tree, 2 short tree
         return collision_layer
@@ -0,0 +1,57 @@
+import math
+from typing import Any
+
+
+class SpatialHash:
+    """
+    Uniform grid of screen space buckets for radius queries.
+
+    Items are inserted with their position once per tick, a query only visits the
+    buckets overlapping the query circle instead of every item.
+    """
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.buckets: dict[tuple[int, int], list[tuple[int, float, float, Any]]] = {}
+        self.count = 0
+
+
+    def clear(self):
+        self.buckets.clear()
+        self.count = 0
+
+
+    def insert(self, item: Any, x: float, y: float):
+        key = (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = []
+        bucket.append((self.count, x, y, item))
+        self.count += 1
+
+
+    def query(self, x: float, y: float, radius: float) -> list[Any]:
+        """
+        Items within radius of (x, y).
+
+        Returns:
+            List of items in insertion order.
+        """
+        min_col = math.floor((x - radius) / self.cell_size)
+        max_col = math.floor((x + radius) / self.cell_size)
+        min_row = math.floor((y - radius) / self.cell_size)
+        max_row = math.floor((y + radius) / self.cell_size)
+        radius_squared = radius * radius
+
+        matches = []
+        for col in range(min_col, max_col + 1):
+            for row in range(min_row, max_row + 1):
+                bucket = self.buckets.get((col, row))
+                if bucket is None:
+                    continue
+                for entry in bucket:
+                    dx = entry[1] - x
+                    dy = entry[2] - y
+                    if dx * dx + dy * dy <= radius_squared:
+                        matches.append(entry)
+        matches.sort(key=lambda entry: entry[0])
+        return [entry[3] for entry in matches]
@@ -0,0 +1,245 @@
+from dataclasses import dataclass, field
+from enum import Enum
+import heapq
+import itertools
+from typing import Any, Callable
+
+import numpy as np
+
+from constants import Constants
+from events import Event, GlobalEventDispatcher
+from game.enemy_store import EnemyStore, EnemyTargetState
+from game.spatial_hash import SpatialHash
+from utils.slot_map import Handle
+
+
+class TargetingEngine(Enum):
+    COVERAGE = "coverage" # Tower coverage tiles and tile occupancy
+    CANDIDATES = "candidates" # Per tower candidate sets updated on tile crossings and damage
+    SPATIAL_HASH = "spatial_hash" # Screen space buckets of living enemies rebuilt every frame
+    VECTORIZED = "vectorized" # NumPy distance matrix
+
+
+def find_weakest_targets(tower_centers, tower_ranges, enemy_centers, enemy_hps):
+    """
+    Weakest enemy in range of every tower in a few array operations.
+
+    Args:
+        tower_centers: (towers, 2) array of tower centers.
+        tower_ranges: (towers,) array of tower ranges.
+        enemy_centers: (enemies, 2) array of enemy sprite centers.
+        enemy_hps: (enemies,) array of enemy hp.
+
+    Returns:
+        (towers,) array with the index of the target enemy, -1 when no enemy is in range.
+        Ties go to the lowest enemy index.
+    """
+    offsets = enemy_centers[np.newaxis, :, :] - tower_centers[:, np.newaxis, :]
+    distances_squared = offsets[:, :, 0] * offsets[:, :, 0] + offsets[:, :, 1] * offsets[:, :, 1]
+    in_range = distances_squared <= (tower_ranges * tower_ranges)[:, np.newaxis]
+
+    masked_hps = np.where(in_range, enemy_hps[np.newaxis, :], np.inf)
+    targets = np.argmin(masked_hps, axis=1) if enemy_hps.size else np.zeros(tower_ranges.size, dtype=np.int64)
+    targets[~in_range.any(axis=1)] = -1
+    return targets
+
+
+class SpatialHashTargeting:
+    """
+    Living enemies bucketed by sprite center in a SpatialHash, rebuilt every frame.
+
+    A tower query only visits the buckets overlapping its range. Enemies are inserted
+    in spawn order, so the first weakest match is the earliest spawned one.
+    """
+    def __init__(self):
+        self.towers = []
+        self.enemy_hash = SpatialHash(Constants.ENEMY_SPATIAL_HASH_CELL_SIZE)
+
+
+    def add_tower(self, tower):
+        self.towers.append(tower)
+
+
+    def get_targets(self, enemy_store: EnemyStore) -> list:
+        """
+        Returns:
+            Target enemy or None for every tower, in placement order.
+        """
+        self.enemy_hash.clear()
+        living_slots = enemy_store.get_living_slots()
+        center_x, center_y = enemy_store.get_sprite_centers(living_slots)
+        for slot, x, y in zip(living_slots.tolist(), center_x.tolist(), center_y.tolist()):
+            self.enemy_hash.insert(slot, x, y)
+
+        hps = enemy_store.hp.tolist()
+        owners = enemy_store.owners
+        target_enemies = []
+        for tower in self.towers:
+            slots = self.enemy_hash.query(tower.center.x, tower.center.y, tower.config.range)
+            target_enemies.append(owners[min(slots, key=hps.__getitem__)] if slots else None)
+        return target_enemies
+
+
+class VectorizedTargeting:
+    """
+    Tower centers and ranges kept in NumPy arrays for find_weakest_targets().
+
+    Towers never move, their rows are appended once at placement. Enemy centers and
+    hp are read from the EnemyStore arrays every frame.
+    """
+    def __init__(self):
+        self.tower_centers = np.empty((0, 2), dtype=np.float64)
+        self.tower_ranges = np.empty(0, dtype=np.float64)
+
+
+    def add_tower(self, tower):
+        self.tower_centers = np.vstack([self.tower_centers, [[tower.center.x, tower.center.y]]])
+        self.tower_ranges = np.append(self.tower_ranges, tower.config.range)
+
+
+    def get_targets(self, enemy_store: EnemyStore) -> list:
+        """
+        Returns:
+            Target enemy or None for every tower, in placement order.
+        """
+        # Spawn order makes the lowest index tie break match the other engines
+        living_slots = enemy_store.get_living_slots()
+        center_x, center_y = enemy_store.get_sprite_centers(living_slots)
+        enemy_centers = np.stack([center_x, center_y], axis=1)
+        enemy_hps = enemy_store.hp[living_slots].astype(np.float64)
+
+        targets = find_weakest_targets(self.tower_centers, self.tower_ranges, enemy_centers, enemy_hps)
+        owners = enemy_store.owners
+        living_slots = living_slots.tolist()
+        return [owners[living_slots[target]] if target >= 0 else None for target in targets.tolist()]
+
+
+@dataclass
+class TowerCandidates:
+    """
+    Handles of the enemies on the coverage tiles of one tower.
+
+    Enemies on inner tiles are always in range and sit in a heap keyed on (hp, spawn
+    order), a damaged enemy gets a fresh entry and outdated entries are dropped when
+    they reach the top. Enemies on edge tiles are distance checked every frame.
+    """
+    tower: object
+    heap: list[tuple[int, int, int, Handle]] = field(default_factory=list)
+    inner_handles: set[Handle] = field(default_factory=set)
+    edge_handles: set[Handle] = field(default_factory=set)
+
+
+class CandidateTargeting:
+    """
+    Incrementally updated tower targeting.
+
+    Towers subscribe to their coverage tiles, EVENT_OCCUPANT_MOVED adds and removes
+    enemies as they cross tile edges and EVENT_ENEMY_DAMAGED refreshes their heap
+    entry. Candidates are held as enemy handles and resolved through
+    get_enemy, a handle of a released enemy simply resolves to None. Per frame work
+    only depends on the enemies near range edges, not the population.
+    """
+    def __init__(self, get_enemy: Callable[[Handle], Any]):
+        self.get_enemy = get_enemy
+        self.tower_candidates: list[TowerCandidates] = []
+        self.tile_watchers: dict[tuple[int, int], list[tuple[TowerCandidates, bool]]] = {}
+        self.sequence = itertools.count() # Keeps heap entries of the same enemy comparable
+        GlobalEventDispatcher.register_listener(self, "CandidateTargeting")
+
+
+    def on_event(self, event: Event) -> bool:
+        # NOTE: handled per enemy step and hit, returning False keeps them out of the event log
+        if event.event_name == Constants.EVENT_OCCUPANT_MOVED:
+            self.move_enemy(event.args["occupant"], event.args["from_index"], event.args["to_index"])
+        elif event.event_name == Constants.EVENT_ENEMY_DAMAGED:
+            self.update_enemy_hp(event.args["handle"], event.args["hp"], event.args["spawn_order"], event.args["tile_index"])
+        return False
+
+
+    def add_tower(self, tower, occupants: list[list[list]]):
+        candidates = TowerCandidates(tower)
+        self.tower_candidates.append(candidates)
+        for col, row in tower.coverage_tiles:
+            is_inner = (col, row) in tower.inner_coverage_tiles
+            self.tile_watchers.setdefault((col, row), []).append((candidates, is_inner))
+            for enemy in occupants[row][col]:
+                self._add_candidate(candidates, is_inner, enemy)
+
+
+    def _add_candidate(self, candidates: TowerCandidates, is_inner: bool, enemy):
+        if is_inner:
+            candidates.inner_handles.add(enemy.handle)
+            self._push(candidates, enemy._hp, enemy.spawn_order, enemy.handle)
+        else:
+            candidates.edge_handles.add(enemy.handle)
+
+
+    def _push(self, candidates: TowerCandidates, hp: int, spawn_order: int, handle: Handle):
+        heapq.heappush(candidates.heap, (hp, spawn_order, next(self.sequence), handle))
+        # Outdated entries only leave at the top, rebuild before they pile up
+        if len(candidates.heap) > 4 * len(candidates.inner_handles) + 16:
+            candidates.heap = []
+            for handle in candidates.inner_handles:
+                inner_enemy = self.get_enemy(handle)
+                if inner_enemy is not None:
+                    candidates.heap.append((inner_enemy._hp, inner_enemy.spawn_order, next(self.sequence), handle))
+            heapq.heapify(candidates.heap)
+
+
+    def move_enemy(self, enemy, from_index: tuple[int, int] | None, to_index: tuple[int, int] | None):
+        for candidates, is_inner in self.tile_watchers.get(from_index, ()):
+            if is_inner:
+                candidates.inner_handles.discard(enemy.handle)
+            else:
+                candidates.edge_handles.discard(enemy.handle)
+        for candidates, is_inner in self.tile_watchers.get(to_index, ()):
+            self._add_candidate(candidates, is_inner, enemy)
+
+
+    def update_enemy_hp(self, handle: Handle, hp: int, spawn_order: int, tile_index: tuple[int, int] | None):
+        for candidates, is_inner in self.tile_watchers.get(tile_index, ()):
+            if is_inner and handle in candidates.inner_handles:
+                self._push(candidates, hp, spawn_order, handle)
+
+
+    def _get_target(self, candidates: TowerCandidates, target_state: EnemyTargetState):
+        alive = target_state.alive
+        hps = target_state.hp
+        heap = candidates.heap
+        target_enemy = None
+        target_key = None
+        while heap:
+            hp, spawn_order, _, handle = heap[0]
+            enemy = self.get_enemy(handle)
+            if enemy is not None and alive[enemy.slot] and hps[enemy.slot] == hp and handle in candidates.inner_handles:
+                target_enemy = enemy
+                target_key = (hp, spawn_order)
+                break
+            heapq.heappop(heap)
+
+        tower = candidates.tower
+        tower_x = tower.center.x
+        tower_y = tower.center.y
+        range_squared = tower.config.range * tower.config.range
+        for handle in candidates.edge_handles:
+            enemy = self.get_enemy(handle)
+            if enemy is None or not alive[enemy.slot]:
+                continue
+            slot = enemy.slot
+            offset_x = target_state.center_x[slot] - tower_x
+            offset_y = target_state.center_y[slot] - tower_y
+            if offset_x * offset_x + offset_y * offset_y > range_squared:
+                continue
+            key = (hps[slot], enemy.spawn_order)
+            if target_key is None or key < target_key:
+                target_enemy = enemy
+                target_key = key
+        return target_enemy
+
+
+    def get_targets(self, target_state: EnemyTargetState) -> list:
+        """
+        Returns:
+            Target enemy or None for every tower, in placement order.
+        """
+        return [self._get_target(candidates, target_state) for candidates in self.tower_candidates]
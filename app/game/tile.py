@@ -3,25 +3,27 @@ from dataclasses import dataclass, field
 import pygame
 
 from custom_types.int_vector2 import IntVector2
+from game.collision_grid import CollisionGrid
+from game.isometric import tile_to_screen
 from constants import Constants
 
 
-@dataclass
+@dataclass(slots=True)
 class Tile:
     index: IntVector2
     values: dict[str, int]
+    collision_grid: CollisionGrid | None = field(default=None, repr=False, compare=False)
     cartesian_position: pygame.Vector2 = field(init=False)
     position: pygame.Vector2 = field(init=False)
     bounds: pygame.Rect = field(init=False)
     isometric_position: pygame.Vector2 = field(init=False)
     cartesian_bounds: pygame.Rect = field(init=False)
     two_high_render_offset_pos: pygame.Vector2 = field(init=False)
+    tile_points: list[tuple[float, float]] = field(init=False)
 
 
     def __post_init__(self):
-        self.position = pygame.Vector2(
-            (self.index.x - self.index.y) * Constants.TILE_RENDER_WIDTH / 2 + Constants.TILE_OFFSET_X,
-            (self.index.x + self.index.y) * Constants.TILE_RENDER_HEIGHT / 2 + Constants.TILE_OFFSET_Y)
+        self.position = pygame.Vector2(tile_to_screen(self.index.x, self.index.y))
 
         self.two_high_render_offset_pos = pygame.Vector2(
             self.position.x,
@@ -51,9 +53,17 @@ class Tile:
             Constants.TILE_RENDER_WIDTH,
             Constants.TILE_RENDER_HEIGHT)
 
+        self.update_collision_grid()
+
 
     def set_placed_layer_value(self, placeable_value: int):
         self.values[Constants.NAME_PLACED_LAYER] = placeable_value
+        self.update_collision_grid()
+
+
+    def update_collision_grid(self):
+        if self.collision_grid is not None:
+            self.collision_grid.set_blocked(self.index.x, self.index.y, not self.can_place())
 
 
     def can_place(self) -> bool:
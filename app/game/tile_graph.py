@@ -0,0 +1,29 @@
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # Cardinal directions (no diagonals)
+
+
+class TileGraph:
+    """
+    Precomputed 4-neighbor adjacency of the tile grid.
+
+    Every tile gets an integer id (x * row_count + y, the same index as CollisionGrid.cells)
+    and a tuple of neighbor ids in DIRECTIONS order. Bounds are resolved once here, grid
+    algorithms walk these integer lists and apply the walkability mask on top.
+    """
+    def __init__(self, col_count: int, row_count: int):
+        self.col_count = col_count
+        self.row_count = row_count
+        self.tile_count = col_count * row_count
+        self.neighbors: list[tuple[int, ...]] = []
+        for x in range(col_count):
+            for y in range(row_count):
+                self.neighbors.append(tuple(
+                    (x + dx) * row_count + (y + dy) for dx, dy in DIRECTIONS
+                        if 0 <= x + dx < col_count and 0 <= y + dy < row_count))
+
+
+    def get_id(self, x: int, y: int) -> int:
+        return x * self.row_count + y
+
+
+    def get_index(self, tile_id: int) -> tuple[int, int]:
+        return divmod(tile_id, self.row_count)
@@ -3,10 +3,13 @@ import pygame
 from game.map_generator import MapConfig
 from game.map import Map
 from renderer import Renderer, RendererType
+from events import Event, GlobalEventDispatcher
 from asset_manager import get_asset_manager
 from custom_types.int_vector2 import IntVector2
 from constants import Constants
 from game.tile import Tile
+from game.collision_grid import CollisionGrid
+from game.isometric import get_tile_depth
 
 class TileManager:
     def __init__(self, map_config: MapConfig):
@@ -14,9 +17,15 @@ class TileManager:
         self.floor_layer = map_config.floor_layer
         self.collision_layer = map_config.collision_layer
         self.tile_sprites = self.asset_manager.tile_sprites
+        self.collision_grid = CollisionGrid(Constants.COLUMN_COUNT, Constants.ROW_COUNT)
+        self.tile_graph = self.collision_grid.tile_graph
         self.tiles = [[self.create_tile(col, row)
             for col in range(Constants.COLUMN_COUNT)]
                 for row in range(Constants.ROW_COUNT)]
+        self.occupants: list[list[list]] = [[[]
+            for _ in range(Constants.COLUMN_COUNT)]
+                for _ in range(Constants.ROW_COUNT)]
+        self.static_layer: pygame.Surface | None = None
 
 
     def create_tile(self, col, row) -> Tile:
@@ -25,21 +34,35 @@ class TileManager:
         values[Constants.NAME_FLOOR_LAYER] = self.floor_layer[row][col]
         values[Constants.NAME_COLLISION_LAYER] = self.collision_layer[row][col]
         values[Constants.NAME_PLACED_LAYER] = Map.PLACED_LAYER[row][col]
-        return Tile(index, values)
+        return Tile(index, values, self.collision_grid)
 
 
-    def draw_floor_layer(self, renderer: Renderer):
+    def move_occupant(self, occupant, from_index: tuple[int, int] | None, to_index: tuple[int, int] | None):
+        if from_index is not None:
+            self.occupants[from_index[1]][from_index[0]].remove(occupant)
+        if to_index is not None:
+            self.occupants[to_index[1]][to_index[0]].append(occupant)
+        GlobalEventDispatcher.dispatch(Event(
+            Constants.EVENT_OCCUPANT_MOVED,
+            {"occupant": occupant, "from_index": from_index, "to_index": to_index}))
+
+
+    def set_placed_layer_value(self, tile: Tile, placeable_value: int):
+        tile.set_placed_layer_value(placeable_value)
+        GlobalEventDispatcher.dispatch(Event(Constants.EVENT_TILE_CHANGED, {"tile": tile}))
+
+
+    def _get_floor_blits(self) -> list[tuple[pygame.Surface, pygame.Vector2]]:
+        blits = []
         for row in range(Constants.ROW_COUNT):
             for col in range(Constants.COLUMN_COUNT):
                 tile = self.tiles[row][col]
                 image = Constants.LAYER_FLOOR_SPRITES[tile.values[Constants.NAME_FLOOR_LAYER]]
                 if image:
-                    renderer.request_on_map_image_draw(
-                        RendererType.FLOOR_TILE,
-                        self.tile_sprites[image],
-                        tile.position,
-                        col,
-                        row)
+                    blits.append((get_tile_depth(col, row), self.tile_sprites[image], tile.position))
+        # Stable sort, tiles on the same depth keep their row by row order
+        blits.sort(key=lambda blit: blit[0])
+        return [(image, position) for _, image, position in blits]
 
 
     def draw_selector(self, renderer: Renderer, row: int, col: int):
@@ -68,23 +91,54 @@ class TileManager:
                         row)
 
 
-    def draw_fence(self, renderer: Renderer):
+    def _get_fence_blits(self) -> list[tuple[pygame.Surface, pygame.Vector2]]:
+        blits = []
         # LEFT
         for row in range(Constants.ROW_COUNT):
             tile = self.tiles[row][0]
-            renderer.request_off_map_image_draw(
-                RendererType.FENCE_LEFT,
+            blits.append((
                 self.asset_manager.tile_sprites[Constants.SPRITE_FENCE_LEFT],
                 pygame.Vector2(
                     tile.position.x - Constants.TILE_RENDER_WIDTH + Constants.TILE_RENDER_WIDTH / 2, # 1 and a half width
-                    tile.position.y - Constants.TILE_RENDER_HEIGHT * 2 + Constants.TILE_RENDER_HEIGHT / 2)) # 2 and a half height
+                    tile.position.y - Constants.TILE_RENDER_HEIGHT * 2 + Constants.TILE_RENDER_HEIGHT / 2))) # 2 and a half height
 
         # TOP
         for col in range(Constants.COLUMN_COUNT):
             tile = self.tiles[0][col]
-            renderer.request_off_map_image_draw(
-                RendererType.FENCE_TOP,
+            blits.append((
                 self.asset_manager.tile_sprites[Constants.SPRITE_FENCE_TOP],
                 pygame.Vector2(
                     tile.position.x + Constants.TILE_RENDER_WIDTH / 2, # half width
-                    tile.position.y - Constants.TILE_RENDER_HEIGHT * 2 + Constants.TILE_RENDER_HEIGHT / 2)) # 2 and a half height
+                    tile.position.y - Constants.TILE_RENDER_HEIGHT * 2 + Constants.TILE_RENDER_HEIGHT / 2))) # 2 and a half height
+        return blits
+
+
+    def get_static_layer(self) -> pygame.Surface:
+        """
+        Fences and floor tiles composited on one screen sized surface.
+
+        Built on first use and kept for the life of the TileManager: nothing edits the
+        floor or the fences during a game and a new map gets a new TileManager. Fences
+        are drawn first like their render layer and the floor tiles follow in depth
+        order. The surface holds premultiplied alpha so blending it once matches
+        blending every sprite on the screen.
+        """
+        if self.static_layer is None:
+            static_layer = pygame.Surface((Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT), pygame.SRCALPHA).convert_alpha()
+            premultiplied_images: dict[int, pygame.Surface] = {}
+            for image, position in self._get_fence_blits() + self._get_floor_blits():
+                premultiplied_image = premultiplied_images.get(id(image))
+                if premultiplied_image is None:
+                    premultiplied_image = premultiplied_images[id(image)] = image.premul_alpha()
+                static_layer.blit(premultiplied_image, position, special_flags=pygame.BLEND_PREMULTIPLIED)
+            self.static_layer = static_layer
+        return self.static_layer
+
+
+    def draw_static_layer(self, renderer: Renderer):
+        # Floor and fences render below every depth sorted layer, one blit keeps that order
+        renderer.request_off_map_image_draw(
+            RendererType.STATIC_LAYER,
+            self.get_static_layer(),
+            (0, 0),
+            pygame.BLEND_PREMULTIPLIED)
@@ -7,6 +7,7 @@ from renderer import Renderer, RendererType
 from asset_manager import get_asset_manager
 from constants import Constants
 from game.tile import Tile
+from game.isometric import get_tiles_in_circle, is_tile_inside_circle
 from events import Event, GlobalEventDispatcher
 
 
@@ -24,6 +25,8 @@ class Tower:
     config: TowerConfig
     elapsed_shoot_time: float = field(default=0)
     shoot_rate: float = field(init=False)
+    coverage_tiles: tuple[tuple[int, int], ...] = field(init=False)
+    inner_coverage_tiles: frozenset[tuple[int, int]] = field(init=False)
 
 
     def __post_init__(self):
@@ -33,6 +36,18 @@ class Tower:
         self.center = pygame.Vector2(
             self.tile.bounds.center[0], self.tile.bounds.center[1])
 
+        # NOTE: enemies are targeted at their sprite center but occupy the tile under
+        # their foot, a third of the sprite height lower, so the range is shifted down
+        coverage_x = self.center.x
+        coverage_y = self.center.y + Constants.SPRITE_ENEMY_RENDER_HEIGHT / 3
+        self.coverage_tiles = tuple(get_tiles_in_circle(coverage_x, coverage_y, self.config.range))
+
+        # Every enemy on an inner tile is in range, the margin keeps float rounding on the
+        # circle edge from disagreeing with the exact distance check
+        self.inner_coverage_tiles = frozenset(
+            (col, row) for col, row in self.coverage_tiles
+                if is_tile_inside_circle(col, row, coverage_x, coverage_y, self.config.range - 1))
+
 
     def _get_damage(self) -> int:
         if self.config.name == Constants.SPRITE_SUN_FLOWER:
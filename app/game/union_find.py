@@ -0,0 +1,30 @@
+class UnionFind:
+    """
+    Disjoint sets over integer ids with union by size and path halving.
+    """
+    def __init__(self, size: int):
+        self.parents = list(range(size))
+        self.sizes = [1] * size
+
+
+    def find(self, item: int) -> int:
+        parents = self.parents
+        while parents[item] != item:
+            parents[item] = parents[parents[item]]
+            item = parents[item]
+        return item
+
+
+    def union(self, a: int, b: int):
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return
+        if self.sizes[root_a] < self.sizes[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parents[root_b] = root_a
+        self.sizes[root_a] += self.sizes[root_b]
+
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
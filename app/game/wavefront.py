@@ -0,0 +1,45 @@
+import numpy as np
+
+from game.collision_grid import CollisionGrid
+
+
+def wavefront_distances(grid: CollisionGrid, goal_x: int, goal_y: int) -> list[int]:
+    """
+    Breadth first distances to the goal, expanded one whole frontier at a time with NumPy.
+
+    The walkability mask is padded with a blocked border and flattened, so the four
+    cardinal neighbors of every frontier tile are fixed index shifts without bounds
+    checks. Each step only touches the frontier, the number of Python level steps is
+    the longest distance instead of the tile count.
+
+    Args:
+        grid: CollisionGrid where 0 = walkable, 1 = blocked (obstacle).
+        goal_x: Goal tile column.
+        goal_y: Goal tile row.
+
+    Returns:
+        Flat list of step counts indexed by tile id, -1 for unreachable tiles.
+    """
+    padded_row_count = grid.row_count + 2
+    unvisited = np.zeros((grid.col_count + 2, padded_row_count), dtype=bool)
+    unvisited[1:-1, 1:-1] = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.col_count, grid.row_count) == 0
+    distances = np.full(unvisited.shape, -1, dtype=np.int32)
+    flat_unvisited = unvisited.ravel()
+    flat_distances = distances.ravel()
+
+    goal = (goal_x + 1) * padded_row_count + goal_y + 1
+    if flat_unvisited[goal]:
+        flat_unvisited[goal] = False
+        flat_distances[goal] = 0
+        shifts = np.array([1, padded_row_count, -1, -padded_row_count])
+        frontier = np.array([goal])
+        distance = 0
+        while frontier.size:
+            distance += 1
+            reached = (frontier[:, None] + shifts).ravel()
+            reached = reached[flat_unvisited[reached]]
+            flat_unvisited[reached] = False
+            frontier = np.unique(reached) # Tiles reached from several frontier tiles appear once
+            flat_distances[frontier] = distance
+
+    return distances[1:-1, 1:-1].ravel().tolist()
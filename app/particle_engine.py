@@ -1,89 +1,59 @@
 from dataclasses import dataclass, field
+
+import numpy as np
 import pygame
 
 from renderer import Renderer, RendererType
+from constants import Constants
+from utils.slot_pool import SlotPool
 
 
+@dataclass(slots=True)
 class Particle:
-    def __init__(self, position: pygame.Vector2, ttl: float, direction: pygame.Vector2, speed: float, size: float, color: pygame.Color, has_gravity: bool, gravity: float = 9.8):
-        self.position = pygame.Vector2(0, 0)
-        self.reset(position, ttl, direction, speed, size, color, has_gravity, gravity)
-
-
-    def reset(self, position: pygame.Vector2, ttl: float, direction: pygame.Vector2, speed: float, size: float, color: pygame.Color, has_gravity: bool, gravity: float = 9.8):
-        self.position.x = position.x
-        self.position.y = position.y
-        self.ttl = ttl
-        self.original_ttl = ttl
-        self.direction = direction
-        self.speed = speed
-        self.size = size
-        self.color = pygame.Color(color.r, color.g, color.b, color.a)
-        self.has_gravity = has_gravity
-        self.velocity = self.direction * self.speed
-        self.gravity = gravity
-
-
-    def is_expired(self):
-        return self.ttl < 0
-
-
-    def update(self, dt):
-        if self.is_expired():
-            return
-
-        self.ttl -= 1 * dt
-
-        if self.has_gravity:
-            self.velocity.x = self.direction.x * self.speed
-            self.velocity.y += self.gravity
-        else:
-            self.velocity = self.direction * self.speed
-
-        self.position += self.velocity * dt
-
-        # Calculate the opacity based on the remaining TTL
-        alpha = max(0, int(255 * (self.ttl / self.original_ttl)))
-        self.color.a = alpha
-
+    position: pygame.Vector2
+    ttl: float
+    direction: pygame.Vector2
+    speed: float
+    size: float
+    color: pygame.Color
+    has_gravity: bool
+    gravity: float = field(default=9.8)
 
-    def draw(self, screen):
-        if self.is_expired():
-            return
-
-        # Create a temporary surface with per-pixel alpha
-        circle_surface = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-        circle_surface = circle_surface.convert_alpha()  # Ensure it supports per-pixel alpha
-
-        # Draw the circle on the temporary surface
-        pygame.draw.circle(
-            circle_surface,
-            self.color,
-            (self.size, self.size),  # Center of the surface
-            self.size
-        )
-
-        # Blit the temporary surface onto the main screen at the correct position
-        screen.blit(circle_surface, (self.position.x - self.size, self.position.y - self.size))
-
-
-    def render(self, renderer: Renderer):
-        if self.is_expired():
-            return
-
-        renderer.request_circle_alpha_draw(
-            RendererType.PARTICLE,
-            self.color,
-            pygame.Vector2(self.position.x - self.size, self.position.y - self.size),
-            self.size,
-            0
-        )
 
-
-@dataclass
 class ParticleEngine:
-    particles: list[Particle] = field(default_factory=list)
-    use_renderer: bool = field(default=False)
+    """
+    Particles stored in NumPy arrays sized to a SlotPool, one row per particle.
+
+    A frame is one vectorized update over the live rows, expired rows go back to the
+    pool's free list for the next emit().
+    """
+    def __init__(self, use_renderer: bool = False):
+        self.use_renderer = use_renderer
+        self.pool = SlotPool(Constants.PARTICLE_POOL_CAPACITY, Constants.PARTICLE_POOL_MAX_CAPACITY, Constants.POOL_SHRINK_USAGE)
+        self.capacity = 0
+        self.active = np.zeros(0, dtype=bool)
+        self.position = np.zeros((0, 2), dtype=np.float64)
+        self.direction = np.zeros((0, 2), dtype=np.float64)
+        self.velocity = np.zeros((0, 2), dtype=np.float64)
+        self.speed = np.zeros(0, dtype=np.float64)
+        self.gravity = np.zeros(0, dtype=np.float64)
+        self.has_gravity = np.zeros(0, dtype=bool)
+        self.ttl = np.zeros(0, dtype=np.float64)
+        self.original_ttl = np.zeros(0, dtype=np.float64)
+        self.size = np.zeros(0, dtype=np.float64)
+        self.color = np.zeros((0, 4), dtype=np.int64)
+        self._resize(self.pool.capacity)
+
+
+    def _resize(self, capacity: int):
+        kept = min(capacity, self.capacity)
+        for name in ["active", "position", "direction", "velocity", "speed", "gravity", "has_gravity", "ttl", "original_ttl", "size", "color"]:
+            array = getattr(self, name)
+            resized = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            resized[:kept] = array[:kept]
+            setattr(self, name, resized)
+        self.capacity = capacity
+
 
     def emit_particle(self, particle: Particle):
         self.emit(
@@ -96,29 +66,82 @@ class ParticleEngine:
             particle.has_gravity)
 
 
-    def emit(self, position: pygame.Vector2, ttl: float, direction: pygame.Vector2, speed: float, size: float, color: pygame.Color, has_gravity: bool = False):
-        for p in self.particles:
-            if p.is_expired():
-                p.reset(position, ttl, direction, speed, size, color, has_gravity)
-                return p
-
-        particle = Particle(position, ttl, direction, speed, size, color, has_gravity)
-        self.particles.append(particle)
-        return particle
+    def emit(self, position: pygame.Vector2, ttl: float, direction: pygame.Vector2, speed: float, size: float, color: pygame.Color, has_gravity: bool = False, gravity: float = 9.8):
+        index = self.pool.allocate()
+        if index is None:
+            return
+        if self.pool.capacity != self.capacity:
+            self._resize(self.pool.capacity)
+
+        self.active[index] = True
+        self.position[index] = (position.x, position.y)
+        self.direction[index] = (direction.x, direction.y)
+        self.velocity[index] = (direction.x * speed, direction.y * speed)
+        self.speed[index] = speed
+        self.gravity[index] = gravity
+        self.has_gravity[index] = has_gravity
+        self.ttl[index] = ttl
+        self.original_ttl[index] = ttl
+        self.size[index] = size
+        self.color[index] = (color.r, color.g, color.b, color.a)
 
 
     def reset(self):
-        self.particles.clear()
+        self.pool.free_all(np.flatnonzero(self.active).tolist())
+        self.active[:] = False
 
 
     def update(self, dt):
-        for p in self.particles:
-            p.update(dt)
+        live = np.flatnonzero(self.active)
+        ttl = self.ttl[live] - 1 * dt
+        self.ttl[live] = ttl
+
+        speed = self.speed[live]
+        velocity = self.velocity[live]
+        velocity[:, 0] = self.direction[live, 0] * speed
+        velocity[:, 1] = np.where(
+            self.has_gravity[live],
+            velocity[:, 1] + self.gravity[live],
+            self.direction[live, 1] * speed)
+        self.velocity[live] = velocity
+        self.position[live] += velocity * dt
+
+        # Calculate the opacity based on the remaining TTL
+        self.color[live, 3] = np.maximum((255 * (ttl / self.original_ttl[live])).astype(np.int64), 0)
+
+        expired = live[ttl < 0].tolist()
+        self.active[expired] = False
+        self.pool.free_all(expired)
+        if self.pool.shrink():
+            self._resize(self.pool.capacity)
 
 
     def draw(self, screen, renderer: Renderer | None = None):
-        for p in self.particles:
+        live = np.flatnonzero(self.active)
+        positions = self.position[live].tolist()
+        sizes = self.size[live].tolist()
+        colors = self.color[live].tolist()
+        for (x, y), size, color in zip(positions, sizes, colors):
             if self.use_renderer and renderer:
-                p.render(renderer)
+                renderer.request_circle_alpha_draw(
+                    RendererType.PARTICLE,
+                    color,
+                    pygame.Vector2(x - size, y - size),
+                    size,
+                    0
+                )
             else:
-                p.draw(screen)
+                # Create a temporary surface with per-pixel alpha
+                circle_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                circle_surface = circle_surface.convert_alpha()  # Ensure it supports per-pixel alpha
+
+                # Draw the circle on the temporary surface
+                pygame.draw.circle(
+                    circle_surface,
+                    color,
+                    (size, size),  # Center of the surface
+                    size
+                )
+
+                # Blit the temporary surface onto the main screen at the correct position
+                screen.blit(circle_surface, (x - size, y - size))
@@ -1,9 +1,10 @@
-from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+
+import numpy as np
 import pygame
 
-from game.map import Map
+from constants import Constants
+from game.isometric import DEPTH_COUNT, get_tile_depth
 
 
 class DrawType(Enum):
@@ -23,7 +24,6 @@ class RendererType(Enum):
     ENEMY_HP_USED = "enemy_hp_used"
     ENEMY_HP_REMAINING = "enemy_hp_remaining"
     SUN_FLOWER_PLACEABLE = "sun_flower_placeable"
-    FLOOR_TILE = "floor_tile"
     EFFECTS_TILE = "effects_tile"
     COLLISION_TILE = "collision_tile"
     CANT_PlACE = "cant_place"
@@ -36,8 +36,7 @@ class RendererType(Enum):
     WAVE_TEXT_SHADOW = "wave_text_shadow"
     DMG_TEXT_SHADOW = "dmg_txt_shadow"
     DMG_TEXT = "dmg_txt"
-    FENCE_LEFT = "fence_left"
-    FENCE_TOP = "fence_top"
+    STATIC_LAYER = "static_layer"
     PARTICLE = "particle"
 
 
@@ -47,188 +46,159 @@ class TextFontType():
         return pygame.font.Font(pygame.font.get_default_font(), size)
 
 
-@dataclass
-class Renderer:
-    render_queue: list[dict[str, Any]] = field(default_factory=list)
+class RenderLayer(Enum):
+    OFF_MAP = 0 # Placeable preview and the static floor and fence layer
+    GROUND = 1 # On the floor: goal path, selector and off map effects
+    EFFECTS = 2 # This should render ontop of existing floor tiles but under enemies
+    OBJECTS = 3 # Enemies, towers and obstacles
+    OVERLAY = 4 # Hp bars and bullets
+    TOP = 5 # ontop of all things: particles, texts and debug
 
 
-    def _get_depth(self, col, row):
-        return Map.DEPTH_LAYER[row][col]
+SUB_ORDER_COUNT = 8
 
 
-    def update(self):
-        self.render_queue.clear()
+def _get_sort_key(layer: RenderLayer, depth: int = 0, sub_order: int = 0) -> int:
+    # Layer first, then tile depth, then the order of draws on the same depth
+    return (layer.value * DEPTH_COUNT + depth) * SUB_ORDER_COUNT + sub_order
 
 
-    def request_off_map_image_draw(self, renderer_type: RendererType, image, position):
-        depth = ""
+def _get_tile_sort_keys(layer: RenderLayer, sub_order: int = 0) -> list[list[int]]:
+    return [[_get_sort_key(layer, get_tile_depth(col, row), sub_order)
+        for col in range(Constants.COLUMN_COUNT)]
+            for row in range(Constants.ROW_COUNT)]
 
-        match renderer_type:
-            case RendererType.SUN_FLOWER_PLACEABLE:
-                depth = "A0"
-            case RendererType.FENCE_LEFT:
-                depth = "A0"
-            case RendererType.FENCE_TOP:
-                depth = "A0"
-            case RendererType.EFFECTS_TILE:
-                depth = f"C{depth}" # This should render ontop of existing floor tiles but under enemies
-
-        self.render_queue.append({
-            'name': renderer_type,
-            'type': DrawType.IMAGE,
-            'image': image,
-            'position': position,
-            'depth': depth,
-        })
 
+# 16 bit keys get NumPy's radix sort, they cover maps up to about 500 tiles a side
+SORT_KEY_DTYPE = np.uint16 if _get_sort_key(RenderLayer.TOP, DEPTH_COUNT) < 2 ** 16 else np.uint32
 
-    def request_on_map_image_draw(self, renderer_type: RendererType, image, position, col, row):
-        depth = self._get_depth(col, row)
-        match renderer_type:
-            case RendererType.PLACED:
-                depth = depth
-            case RendererType.ENEMY:
-                depth = depth
-            case RendererType.SUN_FLOWER_PLACEABLE:
-                depth = depth
-            case RendererType.FLOOR_TILE:
-                depth = f"B{depth}"
-            case RendererType.EFFECTS_TILE:
-                depth = f"D{depth}" # This should render ontop of existing floor tiles but under enemies
-            case RendererType.COLLISION_TILE:
-                depth = depth
-            case _:
-                raise Exception("unknown render type")
+OFF_MAP_IMAGE_SORT_KEYS = {
+    RendererType.SUN_FLOWER_PLACEABLE: _get_sort_key(RenderLayer.OFF_MAP),
+    RendererType.STATIC_LAYER: _get_sort_key(RenderLayer.OFF_MAP),
+    RendererType.EFFECTS_TILE: _get_sort_key(RenderLayer.GROUND),
+}
 
-        self.render_queue.append({
-            'name': renderer_type,
-            'type': DrawType.IMAGE,
-            'image': image,
-            'position': position,
-            'depth': depth,
-        })
+ON_MAP_IMAGE_SORT_KEYS = {
+    RendererType.PLACED: _get_tile_sort_keys(RenderLayer.OBJECTS),
+    RendererType.ENEMY: _get_tile_sort_keys(RenderLayer.OBJECTS),
+    RendererType.SUN_FLOWER_PLACEABLE: _get_tile_sort_keys(RenderLayer.OBJECTS),
+    RendererType.EFFECTS_TILE: _get_tile_sort_keys(RenderLayer.EFFECTS),
+    RendererType.COLLISION_TILE: _get_tile_sort_keys(RenderLayer.OBJECTS),
+}
 
+RECTANGLE_SORT_KEYS = {
+    RendererType.ENEMY_HP_USED: _get_sort_key(RenderLayer.OVERLAY),
+    RendererType.ENEMY_HP_REMAINING: _get_sort_key(RenderLayer.OVERLAY, sub_order=1), # Drawn after the used bar
+    RendererType.DEBUG: _get_sort_key(RenderLayer.TOP),
+}
 
-    def request_rectangle_draw(self, renderer_type: RendererType, color, rect, width):
-        depth = "A"
+CIRCLE_SORT_KEYS = {
+    RendererType.DEBUG: _get_sort_key(RenderLayer.TOP),
+    RendererType.BULLET_OUTER: _get_sort_key(RenderLayer.OVERLAY),
+    RendererType.BULLET_INNER: _get_sort_key(RenderLayer.OVERLAY, sub_order=1),
+    RendererType.GOAL_PATH_OUTER: _get_sort_key(RenderLayer.GROUND, sub_order=1),
+    RendererType.GOAL_PATH_INNER: _get_sort_key(RenderLayer.GROUND, sub_order=2),
+}
 
-        match renderer_type:
-            case RendererType.ENEMY_HP_USED:
-                depth = "xa"
-            case RendererType.ENEMY_HP_REMAINING:
-                depth = "xb" # Prefix with B so that used bar is drawn first
-            case RendererType.DEBUG:
-                depth = "z"
-            case _:
-                raise Exception("unknown render type")
+CIRCLE_ALPHA_SORT_KEYS = {
+    RendererType.PARTICLE: _get_sort_key(RenderLayer.TOP, sub_order=1),
+}
 
-        self.render_queue.append({
-            'name': renderer_type,
-            'type': DrawType.RECTANGLE,
-            'color': color,
-            'rect': rect,
-            'width': width,
-            'depth': depth,
-        })
+SELECTOR_SORT_KEYS = _get_tile_sort_keys(RenderLayer.GROUND, sub_order=3) # Above the goal path
+SELECTOR_OFF_MAP_SORT_KEY = _get_sort_key(RenderLayer.GROUND, sub_order=3)
+POLYGON_DEBUG_SORT_KEY = _get_sort_key(RenderLayer.TOP)
 
+TEXT_SORT_KEYS = {
+    RendererType.DEBUG: _get_sort_key(RenderLayer.TOP),
+    RendererType.DMG_TEXT_SHADOW: _get_sort_key(RenderLayer.TOP, sub_order=1),
+    RendererType.DMG_TEXT: _get_sort_key(RenderLayer.TOP, sub_order=2),
+    RendererType.WAVE_TEXT_SHADOW: _get_sort_key(RenderLayer.TOP, sub_order=3),
+    RendererType.WAVE_TEXT: _get_sort_key(RenderLayer.TOP, sub_order=4),
+}
 
-    def request_circle_draw(self, renderer_type: RendererType, color, center, radius, width):
-        depth = "A"
 
-        match renderer_type:
-            case RendererType.DEBUG:
-                depth = "Z"
-            case RendererType.BULLET_OUTER:
-                depth = "xa"
-            case RendererType.BULLET_INNER:
-                depth = "xb"
-            case RendererType.GOAL_PATH_OUTER:
-                depth = "CA" # Above tile layer B, below obstacles starting on layer D
-            case RendererType.GOAL_PATH_INNER:
-                depth = "CB" # Above tile layer B, below obstacles starting on layer D
-            case _:
-                raise Exception("unknown render type")
+class Renderer:
+    """
+    Buffers the draw requests of a frame and draws them in depth order.
 
-        self.render_queue.append({
-            'name': renderer_type,
-            'type': DrawType.CIRCLE,
-            'color': color,
-            'center': center,
-            'radius': radius,
-            'width': width,
-            'depth': depth,
-        })
+    Commands live in parallel buffers reused across frames: an integer sort key, the
+    draw type and the draw arguments. Sort keys pack the RenderLayer, the tile depth
+    and a sub order, they are looked up per RendererType and tile and the frame is
+    ordered with one stable sort over the keys.
+    """
+    def __init__(self, capacity: int = 1024):
+        self.count = 0
+        self.sort_keys = np.zeros(capacity, dtype=SORT_KEY_DTYPE)
+        self.draw_types: list[DrawType | None] = [None] * capacity
+        self.draw_args: list[tuple] = [()] * capacity
 
 
-    def request_circle_alpha_draw(self, renderer_type: RendererType, color, position, radius, width):
-        depth = "A"
+    def update(self):
+        self.count = 0
 
-        match renderer_type:
-            case RendererType.PARTICLE:
-                depth = "za" # ontop of all things
-            case _:
-                raise Exception("unknown render type")
 
-        self.render_queue.append({
-            'name': renderer_type,
-            'type': DrawType.CIRCLE_ALPHA,
-            'color': color,
-            'position': position,
-            'radius': radius,
-            'width': width,
-            'depth': depth
-        })
+    def _add_command(self, sort_key: int, draw_type: DrawType, draw_args: tuple):
+        index = self.count
+        if index == len(self.draw_types):
+            self.sort_keys = np.concatenate([self.sort_keys, np.zeros(index, dtype=self.sort_keys.dtype)])
+            self.draw_types.extend([None] * index)
+            self.draw_args.extend([()] * index)
+        self.sort_keys[index] = sort_key
+        self.draw_types[index] = draw_type
+        self.draw_args[index] = draw_args
+        self.count += 1
 
 
-    def request_polygon_draw(self, renderer_type: RendererType, color, points, width, col = -1, row = -1):
-        depth = "A"
-        if col > 0 and row > 0:
-            depth = self._get_depth(col, row)
+    def request_off_map_image_draw(self, renderer_type: RendererType, image, position, special_flags: int = 0):
+        sort_key = OFF_MAP_IMAGE_SORT_KEYS.get(renderer_type, 0)
+        self._add_command(sort_key, DrawType.IMAGE, (image, position, special_flags))
 
-        match renderer_type:
-            case RendererType.DEBUG:
-                depth = "Z"
-            case RendererType.SELECTOR | RendererType.CANT_PlACE:
-                depth = f"C{depth}" # Above tile layer, below obstacles
-            case _:
-                raise Exception("unknown render type")
 
-        self.render_queue.append({
-            'name': renderer_type,
-            'type': DrawType.POLYGON,
-            'color': color,
-            'points': points,
-            'width': width,
-            'depth': depth,
-        })
+    def request_on_map_image_draw(self, renderer_type: RendererType, image, position, col, row):
+        tile_sort_keys = ON_MAP_IMAGE_SORT_KEYS.get(renderer_type)
+        if tile_sort_keys is None:
+            raise Exception("unknown render type")
+        self._add_command(tile_sort_keys[row][col], DrawType.IMAGE, (image, position, 0))
 
 
-    def request_text_draw_alpha(self, renderer_type: RendererType, color: pygame.Color, text, font_type: pygame.font.Font, center_pos: pygame.Vector2):
-        depth = "A"
+    def request_rectangle_draw(self, renderer_type: RendererType, color, rect, width):
+        sort_key = RECTANGLE_SORT_KEYS.get(renderer_type)
+        if sort_key is None:
+            raise Exception("unknown render type")
+        self._add_command(sort_key, DrawType.RECTANGLE, (color, rect, width))
+
 
+    def request_circle_draw(self, renderer_type: RendererType, color, center, radius, width):
+        sort_key = CIRCLE_SORT_KEYS.get(renderer_type)
+        if sort_key is None:
+            raise Exception("unknown render type")
+        self._add_command(sort_key, DrawType.CIRCLE, (color, center, radius, width))
+
+
+    def request_circle_alpha_draw(self, renderer_type: RendererType, color, position, radius, width):
+        sort_key = CIRCLE_ALPHA_SORT_KEYS.get(renderer_type)
+        if sort_key is None:
+            raise Exception("unknown render type")
+        self._add_command(sort_key, DrawType.CIRCLE_ALPHA, (color, position, radius))
+
+
+    def request_polygon_draw(self, renderer_type: RendererType, color, points, width, col = -1, row = -1):
         match renderer_type:
             case RendererType.DEBUG:
-                depth = "Z"
-            case RendererType.DMG_TEXT_SHADOW:
-                depth = "za"
-            case RendererType.DMG_TEXT:
-                depth = "zb"
-            case RendererType.WAVE_TEXT_SHADOW:
-                depth = "zy"
-            case RendererType.WAVE_TEXT:
-                depth = "zz"
+                sort_key = POLYGON_DEBUG_SORT_KEY
+            case RendererType.SELECTOR | RendererType.CANT_PlACE:
+                sort_key = SELECTOR_SORT_KEYS[row][col] if col >= 0 and row >= 0 else SELECTOR_OFF_MAP_SORT_KEY
             case _:
                 raise Exception("unknown render type")
 
-        self.render_queue.append({
-            'name': renderer_type,
-            'type': DrawType.TEXT,
-            'color': color,
-            'text': text,
-            'font_type': font_type,
-            'center_pos': center_pos,
-            'depth': depth,
-        })
+        self._add_command(sort_key, DrawType.POLYGON, (color, points, width))
+
+
+    def request_text_draw_alpha(self, renderer_type: RendererType, color: pygame.Color, text, font_type: pygame.font.Font, center_pos: pygame.Vector2):
+        sort_key = TEXT_SORT_KEYS.get(renderer_type)
+        if sort_key is None:
+            raise Exception("unknown render type")
+        self._add_command(sort_key, DrawType.TEXT, (color, text, font_type, center_pos))
 
 
     def request_text_draw(self, renderer_type: RendererType, color: str, text, font_type: pygame.font.Font, center_pos: pygame.Vector2):
@@ -247,36 +217,38 @@ class Renderer:
 
 
     def draw(self, screen: pygame.Surface):
-        # Sort render queue by depth
-        self.render_queue.sort(key=lambda item: item['depth'])
-
-        # TODO: Review if moving from upper to lower depth needs custom sort. e.g. Z to a
-        #self.render_queue.sort(key=lambda item: (item['depth'].lower(), item['depth'].islower()))
-
-        # Draw all items in order
-        for item in self.render_queue:
-            if item['type'] == DrawType.IMAGE:
-                screen.blit(item['image'], item['position'])
-            elif item['type'] == DrawType.RECTANGLE:
-                pygame.draw.rect(screen, item['color'], item['rect'], item['width'])
-            elif item['type'] == DrawType.CIRCLE:
-                pygame.draw.circle(screen, item['color'], item['center'], item['radius'], item['width'])
-            elif item['type'] == DrawType.CIRCLE_ALPHA:
-                self.draw_alpha_circle(screen, item)
-            elif item['type'] == DrawType.POLYGON:
-                pygame.draw.polygon(screen, item['color'], item['points'], item['width'])
-            elif item['type'] == DrawType.TEXT:
-                font: pygame.font.Font = item['font_type']
-                text_surface = font.render(item["text"], True, item["color"])
-                text_surface.set_alpha(item["color"].a)
-                text_rect = text_surface.get_rect(center=(item["center_pos"].x, item["center_pos"].y))
+        # Stable sort keeps the request order within a sort key
+        order = np.argsort(self.sort_keys[:self.count], kind="stable")
+
+        # Draw all commands in order
+        draw_types = self.draw_types
+        draw_args = self.draw_args
+        for index in order.tolist():
+            draw_type = draw_types[index]
+            args = draw_args[index]
+            if draw_type == DrawType.IMAGE:
+                screen.blit(args[0], args[1], None, args[2])
+            elif draw_type == DrawType.RECTANGLE:
+                pygame.draw.rect(screen, args[0], args[1], args[2])
+            elif draw_type == DrawType.CIRCLE:
+                pygame.draw.circle(screen, args[0], args[1], args[2], args[3])
+            elif draw_type == DrawType.CIRCLE_ALPHA:
+                self.draw_alpha_circle(screen, *args)
+            elif draw_type == DrawType.POLYGON:
+                pygame.draw.polygon(screen, args[0], args[1], args[2])
+            elif draw_type == DrawType.TEXT:
+                color, text, font, center_pos = args
+                text_surface = font.render(text, True, color)
+                text_surface.set_alpha(color.a)
+                text_rect = text_surface.get_rect(center=(center_pos.x, center_pos.y))
                 screen.blit(text_surface, text_rect)
 
-    def draw_alpha_circle(self, screen: pygame.Surface, item):
-        size = item['radius']
-        position = item['position']
-        color = item['color']
+        # Drop the references so surfaces and rects of this frame can be freed
+        for index in range(self.count):
+            draw_args[index] = ()
+
 
+    def draw_alpha_circle(self, screen: pygame.Surface, color, position, size):
         # Create a temporary surface with per-pixel alpha
         circle_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
         circle_surface = circle_surface.convert_alpha()  # Ensure it supports per-pixel alpha
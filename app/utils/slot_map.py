@@ -0,0 +1,95 @@
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+
+@dataclass(frozen=True, slots=True)
+class Handle:
+    index: int
+    generation: int
+
+
+class SlotMap:
+    """
+    Packed container with stable generational handles.
+
+    Values sit in a dense list for iteration, removal moves the last value into the
+    hole so it is O(1) but doesn't keep the order. A handle stays valid until its
+    value is removed, afterwards get() returns None even once the slot is reused.
+    """
+    def __init__(self):
+        self.values: list[Any] = []
+        self.value_slots: list[int] = [] # Slot of every dense value
+        self.dense_indexes: list[int] = [] # Dense index of every slot
+        self.generations: list[int] = []
+        self.free_slots: list[int] = []
+
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.values)
+
+
+    def items(self) -> list[tuple[Handle, Any]]:
+        """
+        Returns:
+            (handle, value) pairs in dense order, a copy so values can be removed while iterating it.
+        """
+        generations = self.generations
+        return [(Handle(slot, generations[slot]), value) for slot, value in zip(self.value_slots, self.values)]
+
+
+    def get_next_handle(self) -> Handle:
+        """
+        Returns:
+            The handle the next insert() returns, for values that need it while being built.
+        """
+        if self.free_slots:
+            slot = self.free_slots[-1]
+            return Handle(slot, self.generations[slot])
+        return Handle(len(self.generations), 0)
+
+
+    def insert(self, value: Any) -> Handle:
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.generations)
+            self.generations.append(0)
+            self.dense_indexes.append(-1)
+
+        self.dense_indexes[slot] = len(self.values)
+        self.values.append(value)
+        self.value_slots.append(slot)
+        return Handle(slot, self.generations[slot])
+
+
+    def get(self, handle: Handle) -> Any | None:
+        if handle.index >= len(self.generations) or self.generations[handle.index] != handle.generation:
+            return None
+        return self.values[self.dense_indexes[handle.index]]
+
+
+    def remove(self, handle: Handle) -> Any | None:
+        """
+        Returns:
+            The removed value, or None if the handle was already stale.
+        """
+        value = self.get(handle)
+        if value is None:
+            return None
+
+        dense_index = self.dense_indexes[handle.index]
+        last_slot = self.value_slots[-1]
+        self.values[dense_index] = self.values[-1]
+        self.value_slots[dense_index] = last_slot
+        self.dense_indexes[last_slot] = dense_index
+        self.values.pop()
+        self.value_slots.pop()
+
+        self.dense_indexes[handle.index] = -1
+        self.generations[handle.index] += 1
+        self.free_slots.append(handle.index)
+        return value
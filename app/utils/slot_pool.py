@@ -0,0 +1,88 @@
+import heapq
+
+
+class SlotPool:
+    """
+    Free list of slot indexes for the pooled engines.
+
+    Allocation pops the lowest free slot, or doubles the capacity up to max_capacity when the
+    free list is empty. Engines size their storage to the pool capacity and hand
+    expired slots back with free(). Handing out the lowest slot first keeps live slots
+    packed at the bottom, so once usage falls to shrink_usage of the capacity and the
+    upper half has drained, shrink() halves the capacity again, down to the initial
+    capacity. A plain stack would be cheaper per call but leaves live slots scattered
+    over the whole capacity after a burst, so the pool could never shrink.
+    """
+    def __init__(self, capacity: int, max_capacity: int, shrink_usage: float = 0.25):
+        self.min_capacity = capacity
+        self.max_capacity = max_capacity
+        self.shrink_usage = shrink_usage # 0 never shrinks
+        self.capacity = 0
+        self.free_slots: list[int] = [] # Min-heap
+        self.allocated = bytearray()
+        self.count = 0
+        self.upper_count = 0 # Allocated slots in the upper half of the capacity
+        self._resize(capacity)
+
+
+    def _resize(self, capacity: int):
+        if capacity > self.capacity:
+            # New slots are all above the free ones, appending keeps the heap valid
+            self.free_slots.extend(range(self.capacity, capacity))
+            self.allocated.extend(bytes(capacity - self.capacity))
+        else:
+            self.free_slots = [slot for slot in self.free_slots if slot < capacity]
+            heapq.heapify(self.free_slots)
+            del self.allocated[capacity:]
+        self.capacity = capacity
+        self.upper_count = self.allocated.count(1, capacity // 2)
+
+
+    def allocate(self) -> int | None:
+        """
+        Returns:
+            A free slot, or None if the pool is full and can't grow.
+        """
+        if not self.free_slots:
+            if self.capacity >= self.max_capacity:
+                return None
+            self._resize(min(self.capacity * 2, self.max_capacity))
+
+        slot = heapq.heappop(self.free_slots)
+        self.allocated[slot] = 1
+        self.count += 1
+        if slot >= self.capacity // 2:
+            self.upper_count += 1
+        return slot
+
+
+    def free(self, slot: int):
+        self.free_all([slot])
+
+
+    def free_all(self, slots: list[int]):
+        half_capacity = self.capacity // 2
+        for slot in slots:
+            self.allocated[slot] = 0
+            heapq.heappush(self.free_slots, slot)
+            if slot >= half_capacity:
+                self.upper_count -= 1
+        self.count -= len(slots)
+
+
+    def shrink(self) -> bool:
+        """
+        Halve the capacity if the usage allows it.
+
+        Returns:
+            True if the capacity changed.
+        """
+        half_capacity = self.capacity // 2
+        if (self.upper_count > 0
+            or self.shrink_usage <= 0
+            or half_capacity < self.min_capacity
+            or self.count > self.capacity * self.shrink_usage):
+            return False
+
+        self._resize(half_capacity)
+        return True
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The game runs from app/ with flat imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
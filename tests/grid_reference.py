@@ -0,0 +1,72 @@
+"""
+Plain reference algorithms the optimized grid code is checked against.
+"""
+from collections import deque
+import heapq
+import random
+
+from game.collision_grid import CollisionGrid
+
+
+def make_random_grid(col_count: int, row_count: int, blocked_share: float, seed: int) -> CollisionGrid:
+    rng = random.Random(seed)
+    grid = CollisionGrid(col_count, row_count)
+    for x in range(col_count):
+        for y in range(row_count):
+            if rng.random() < blocked_share:
+                grid.set_blocked(x, y, True)
+    return grid
+
+
+def get_neighbors(grid: CollisionGrid, x: int, y: int) -> list[tuple[int, int]]:
+    return [(x + dx, y + dy) for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]
+        if 0 <= x + dx < grid.col_count and 0 <= y + dy < grid.row_count and not grid.is_blocked(x + dx, y + dy)]
+
+
+def bfs_distances(grid: CollisionGrid, goal: tuple[int, int]) -> dict[tuple[int, int], int]:
+    """
+    Step count to goal of every walkable tile that reaches it.
+    """
+    if grid.is_blocked(*goal):
+        return {}
+    distances = {goal: 0}
+    queue = deque([goal])
+    while queue:
+        current = queue.popleft()
+        for neighbor in get_neighbors(grid, *current):
+            if neighbor not in distances:
+                distances[neighbor] = distances[current] + 1
+                queue.append(neighbor)
+    return distances
+
+
+def dijkstra_cost(grid: CollisionGrid, start: tuple[int, int], goal: tuple[int, int], tile_costs) -> int | None:
+    """
+    Cheapest cost of entering every tile on the way from start to goal, None if unreachable.
+    """
+    costs = {start: 0}
+    open_set = [(0, start)]
+    while open_set:
+        cost, current = heapq.heappop(open_set)
+        if current == goal:
+            return cost
+        if cost > costs[current]:
+            continue
+        for neighbor in get_neighbors(grid, *current):
+            neighbor_cost = cost + tile_costs[grid.tile_graph.get_id(*neighbor)]
+            if neighbor not in costs or neighbor_cost < costs[neighbor]:
+                costs[neighbor] = neighbor_cost
+                heapq.heappush(open_set, (neighbor_cost, neighbor))
+    return None
+
+
+def is_valid_path(grid: CollisionGrid, path: list[tuple[int, int]], start: tuple[int, int], goal: tuple[int, int]) -> bool:
+    """
+    Path runs from start to goal over walkable 4-neighbors, the start tile may be blocked.
+    """
+    if not path or tuple(path[0]) != start or tuple(path[-1]) != goal:
+        return False
+    for (ax, ay), (bx, by) in zip(path, path[1:]):
+        if abs(ax - bx) + abs(ay - by) != 1 or grid.is_blocked(bx, by):
+            return False
+    return True
@@ -0,0 +1,39 @@
+import pytest
+
+from custom_types.int_vector2 import IntVector2
+from game.blocking_index import BlockingIndex
+from grid_reference import bfs_distances, make_random_grid
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_blocking_tiles_match_path_search(seed):
+    grid = make_random_grid(9, 8, 0.3, seed)
+    start = (0, 0)
+    goal = (8, 7)
+    grid.set_blocked(*start, False)
+    grid.set_blocked(*goal, False)
+    blocking_index = BlockingIndex(IntVector2(*start), IntVector2(*goal))
+    blocking_index.update(grid)
+
+    for x in range(grid.col_count):
+        for y in range(grid.row_count):
+            if (x, y) == start or grid.is_blocked(x, y):
+                continue
+            grid.set_blocked(x, y, True)
+            cuts_path = start not in bfs_distances(grid, goal)
+            grid.set_blocked(x, y, False)
+            assert blocking_index.blocks_goal_path(x, y) == cuts_path, (x, y)
+
+
+def test_update_follows_grid_version():
+    grid = make_random_grid(6, 6, 0, 0)
+    blocking_index = BlockingIndex(IntVector2(0, 0), IntVector2(5, 0))
+    blocking_index.update(grid)
+    assert not blocking_index.blocks_goal_path(2, 0)
+
+    # Leave a single corridor through (2, 0)
+    for y in range(1, 6):
+        grid.set_blocked(2, y, True)
+    blocking_index.update(grid)
+    assert blocking_index.blocks_goal_path(2, 0)
+    assert not blocking_index.blocks_goal_path(1, 3)
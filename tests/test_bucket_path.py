@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from game.astar import astar
+from game.bucket_path import dial_path
+from grid_reference import bfs_distances, dijkstra_cost, is_valid_path, make_random_grid
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_unit_costs_match_astar(seed):
+    rng = random.Random(seed)
+    grid = make_random_grid(12, 10, 0.25, seed)
+    for _ in range(30):
+        start = (rng.randrange(12), rng.randrange(10))
+        goal = (rng.randrange(12), rng.randrange(10))
+        if grid.is_blocked(*start):
+            continue
+        path = dial_path(grid, start, goal)
+        distances = bfs_distances(grid, goal)
+        assert len(path) == len(astar(grid, start, goal))
+        if start in distances:
+            assert is_valid_path(grid, path, start, goal)
+            assert len(path) == distances[start] + 1
+        else:
+            assert path == []
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_weighted_costs_match_dijkstra(seed):
+    rng = random.Random(seed)
+    grid = make_random_grid(12, 10, 0.2, seed)
+    tile_costs = bytearray(rng.randint(1, 4) for _ in range(grid.tile_graph.tile_count))
+    for _ in range(30):
+        start = (rng.randrange(12), rng.randrange(10))
+        goal = (rng.randrange(12), rng.randrange(10))
+        if grid.is_blocked(*start):
+            continue
+        path = dial_path(grid, start, goal, tile_costs)
+        expected_cost = dijkstra_cost(grid, start, goal, tile_costs)
+        if expected_cost is None:
+            assert path == []
+            continue
+        assert is_valid_path(grid, path, start, goal)
+        assert sum(tile_costs[grid.tile_graph.get_id(*tile)] for tile in path[1:]) == expected_cost
@@ -0,0 +1,44 @@
+import random
+
+import numpy as np
+import pygame
+import pytest
+
+from game.bullet_manager import BulletManager
+
+
+def get_hits_in_order(bullet_manager: BulletManager, lefts, tops, width: int, height: int) -> list[int | None]:
+    # Baseline: every rect takes the first live bullet inside it, that bullet is spent
+    active = bullet_manager.active.copy()
+    hits = []
+    for left, top in zip(lefts, tops):
+        hit = None
+        for slot in np.flatnonzero(active).tolist():
+            x, y = bullet_manager.position[slot]
+            size = bullet_manager.size[slot]
+            if left <= x - size and left + width >= x + size and top <= y - size and top + height >= y + size:
+                hit = slot
+                active[slot] = False
+                break
+        hits.append(hit)
+    return hits
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_all_collisions_match_in_order_hits(seed):
+    rng = random.Random(seed)
+    bullet_manager = BulletManager()
+    for damage in range(rng.randint(0, 15)):
+        bullet_manager.shoot(
+            pygame.Vector2(rng.uniform(0, 60), rng.uniform(0, 60)),
+            pygame.Vector2(rng.uniform(0, 60), rng.uniform(0, 60)),
+            {"speed": 1, "color": "yellow", "damage": damage, "effect": ""})
+    lefts = np.array([rng.randint(0, 50) for _ in range(10)])
+    tops = np.array([rng.randint(0, 50) for _ in range(10)])
+
+    expected_hits = get_hits_in_order(bullet_manager, lefts, tops, 20, 20)
+    expected_damages = [None if slot is None else int(bullet_manager.damage[slot]) for slot in expected_hits]
+    collisions = bullet_manager.get_all_collisions(lefts, tops, 20, 20)
+
+    assert [None if collision is None else collision.damage for collision in collisions] == expected_damages
+    assert not bullet_manager.active[[slot for slot in expected_hits if slot is not None]].any()
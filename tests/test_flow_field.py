@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from custom_types.int_vector2 import IntVector2
+from game.flow_field import UNREACHABLE, FlowField
+from grid_reference import bfs_distances, is_valid_path, make_random_grid
+
+
+def assert_matches_bfs(flow_field: FlowField, grid, goal: tuple[int, int]):
+    expected = bfs_distances(grid, goal)
+    for x in range(grid.col_count):
+        for y in range(grid.row_count):
+            if not grid.is_blocked(x, y):
+                assert flow_field.get_distance(x, y) == expected.get((x, y), UNREACHABLE), (x, y)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_compute_matches_bfs(seed):
+    grid = make_random_grid(12, 9, 0.25, seed)
+    grid.set_blocked(0, 0, False)
+    flow_field = FlowField(IntVector2(0, 0))
+    flow_field.compute(grid)
+    assert_matches_bfs(flow_field, grid, (0, 0))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_repair_matches_recompute(seed):
+    rng = random.Random(seed)
+    grid = make_random_grid(10, 10, 0.2, seed)
+    goal = (9, 9)
+    grid.set_blocked(*goal, False)
+    flow_field = FlowField(IntVector2(*goal))
+    flow_field.compute(grid)
+
+    for _ in range(60):
+        x, y = rng.randrange(10), rng.randrange(10)
+        blocked = not grid.is_blocked(x, y)
+        before = list(flow_field.distances)
+        grid.set_blocked(x, y, blocked)
+        changed = flow_field.set_blocked(x, y, blocked)
+
+        assert_matches_bfs(flow_field, grid, goal)
+        for tile_id, (old, new) in enumerate(zip(before, flow_field.distances)):
+            if old != new:
+                assert grid.tile_graph.get_index(tile_id) in changed
+
+
+def test_path_follows_field():
+    grid = make_random_grid(12, 12, 0.2, 7)
+    goal = (11, 0)
+    grid.set_blocked(*goal, False)
+    flow_field = FlowField(IntVector2(*goal))
+    flow_field.compute(grid)
+
+    distances = bfs_distances(grid, goal)
+    for start, distance in distances.items():
+        path = flow_field.get_path(IntVector2(*start))
+        assert is_valid_path(grid, path, start, goal)
+        assert len(path) == distance + 1
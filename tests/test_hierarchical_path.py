@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from game.hierarchical_path import HierarchicalPathfinder
+from grid_reference import bfs_distances, is_valid_path, make_random_grid
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_paths_are_valid_and_reach_like_bfs(seed):
+    rng = random.Random(seed)
+    grid = make_random_grid(16, 12, 0.25, seed)
+    pathfinder = HierarchicalPathfinder(grid, 4)
+
+    for _ in range(40):
+        start = (rng.randrange(16), rng.randrange(12))
+        goal = (rng.randrange(16), rng.randrange(12))
+        if grid.is_blocked(*start):
+            continue
+        distances = bfs_distances(grid, goal)
+        path = pathfinder.get_path(start, goal)
+        if start not in distances:
+            assert path == []
+            continue
+        assert is_valid_path(grid, path, start, goal)
+        assert len(path) >= distances[start] + 1
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_update_matches_fresh_build(seed):
+    rng = random.Random(seed)
+    grid = make_random_grid(14, 11, 0.2, seed)
+    pathfinder = HierarchicalPathfinder(grid, 5)
+
+    for _ in range(25):
+        for _ in range(rng.randint(1, 4)):
+            grid.set_blocked(rng.randrange(14), rng.randrange(11), rng.random() < 0.6)
+        pathfinder.update()
+        fresh_pathfinder = HierarchicalPathfinder(grid, 5)
+        assert pathfinder.abstract_graph == fresh_pathfinder.abstract_graph
+        assert pathfinder.borders == fresh_pathfinder.borders
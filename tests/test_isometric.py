@@ -0,0 +1,82 @@
+import math
+import random
+
+import numpy as np
+
+from constants import Constants
+from custom_types.int_vector2 import IntVector2
+from game.isometric import (HALF_HEIGHT, HALF_WIDTH, get_tiles_in_circle, screen_to_tile, screens_to_tiles,
+    tile_to_screen, tiles_to_screen)
+from game.tile import Tile
+
+
+TILES = [Tile(IntVector2(col, row), {})
+    for row in range(Constants.ROW_COUNT)
+        for col in range(Constants.COLUMN_COUNT)]
+
+
+def scan_screen_to_tile(px: float, py: float) -> tuple[int, int] | None:
+    # Baseline: walk the tiles row by row until one contains the point
+    for tile in TILES:
+        if tile.contains_point(px, py):
+            return tile.index.x, tile.index.y
+    return None
+
+
+def get_random_points(count: int, seed: int) -> list[tuple[float, float]]:
+    rng = random.Random(seed)
+    return [(rng.uniform(0, Constants.SCREEN_WIDTH), rng.uniform(0, Constants.SCREEN_HEIGHT)) for _ in range(count)]
+
+
+def test_tile_center_round_trip():
+    for col in range(Constants.COLUMN_COUNT):
+        for row in range(Constants.ROW_COUNT):
+            left, top = tile_to_screen(col, row)
+            assert screen_to_tile(left + HALF_WIDTH, top + HALF_HEIGHT) == (col, row)
+
+
+def test_screen_to_tile_matches_scan():
+    for px, py in get_random_points(3000, 0):
+        assert screen_to_tile(px, py) == scan_screen_to_tile(px, py), (px, py)
+
+
+def test_batched_transforms_match_scalar():
+    points = get_random_points(500, 1)
+    cols, rows, inside = screens_to_tiles([px for px, _ in points], [py for _, py in points])
+    for (px, py), col, row, is_inside in zip(points, cols.tolist(), rows.tolist(), inside.tolist()):
+        tile = screen_to_tile(px, py)
+        assert is_inside == (tile is not None)
+        if tile is not None:
+            assert (col, row) == tile
+
+    cols, rows = np.meshgrid(np.arange(Constants.COLUMN_COUNT), np.arange(Constants.ROW_COUNT))
+    xs, ys = tiles_to_screen(cols.ravel(), rows.ravel())
+    assert list(zip(xs.tolist(), ys.tolist())) == [tile_to_screen(col, row) for col, row in zip(cols.ravel().tolist(), rows.ravel().tolist())]
+
+
+def get_diamond_distance(col: int, row: int, x: float, y: float) -> float:
+    # Sampled distance from the point to the tile diamond, 0 inside it
+    left, top = tile_to_screen(col, row)
+    center_x = left + HALF_WIDTH
+    center_y = top + HALF_HEIGHT
+    if abs(x - center_x) / HALF_WIDTH + abs(y - center_y) / HALF_HEIGHT <= 1:
+        return 0
+    corners = [(center_x, top), (left, center_y), (center_x, top + 2 * HALF_HEIGHT), (left + 2 * HALF_WIDTH, center_y)]
+    samples = []
+    for corner_index, (ax, ay) in enumerate(corners):
+        bx, by = corners[(corner_index + 1) % len(corners)]
+        samples += [(ax + (bx - ax) * step / 100, ay + (by - ay) * step / 100) for step in range(100)]
+    return min(math.hypot(sample_x - x, sample_y - y) for sample_x, sample_y in samples)
+
+
+def test_tiles_in_circle_match_all_tiles():
+    sample_error = math.hypot(HALF_WIDTH, HALF_HEIGHT) / 100
+    for x, y in get_random_points(12, 2):
+        radius = random.Random(int(x)).uniform(20, 200)
+        tiles = set(get_tiles_in_circle(x, y, radius))
+        for tile in TILES:
+            distance = get_diamond_distance(tile.index.x, tile.index.y, x, y)
+            if distance <= radius - sample_error:
+                assert (tile.index.x, tile.index.y) in tiles
+            elif distance > radius:
+                assert (tile.index.x, tile.index.y) not in tiles
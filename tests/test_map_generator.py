@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from constants import Constants
+from custom_types.int_vector2 import IntVector2
+from game.collision_grid import CollisionGrid
+from game.map_generator import MapGenerator
+from game.tile_graph import TileGraph
+from game.union_find import UnionFind
+from grid_reference import bfs_distances
+
+
+def get_grid(collision_layer: list[list[int]], blocked_tiles: list[int], tile_graph: TileGraph) -> CollisionGrid:
+    grid = CollisionGrid(tile_graph.col_count, tile_graph.row_count)
+    for row in range(tile_graph.row_count):
+        for col in range(tile_graph.col_count):
+            grid.set_blocked(col, row, collision_layer[row][col] != 0)
+    for tile_id in blocked_tiles:
+        grid.set_blocked(*tile_graph.get_index(tile_id), True)
+    return grid
+
+
+def get_greedy_collision_tiles(collision_layer, collision_tiles, start, end, tile_graph) -> list[int]:
+    # Baseline: place the tiles one by one and search the path again after each one
+    kept_tiles = []
+    for tile_id in collision_tiles:
+        grid = get_grid(collision_layer, kept_tiles + [tile_id], tile_graph)
+        if start in bfs_distances(grid, end):
+            kept_tiles.append(tile_id)
+    return kept_tiles
+
+
+def test_union_find_joins_sets():
+    union_find = UnionFind(6)
+    union_find.union(0, 1)
+    union_find.union(2, 3)
+    union_find.union(1, 3)
+    assert union_find.connected(0, 2)
+    assert not union_find.connected(0, 4)
+    assert not union_find.connected(4, 5)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_connected_collision_tiles_match_greedy_search(seed):
+    rng = random.Random(seed)
+    random.seed(seed)
+    map_generator = MapGenerator()
+    tile_graph = TileGraph(8, 8)
+    collision_layer = [[1 if rng.random() < 0.1 else 0 for _ in range(8)] for _ in range(8)]
+    start = (0, 0)
+    end = (7, 7)
+    collision_layer[0][0] = collision_layer[7][7] = 0
+    if start not in bfs_distances(get_grid(collision_layer, [], tile_graph), end):
+        pytest.skip("fixed layer already cuts the path")
+    free_tiles = [tile_id for tile_id in range(tile_graph.tile_count)
+        if tile_id not in (tile_graph.get_id(*start), tile_graph.get_id(*end))
+            and collision_layer[tile_graph.get_index(tile_id)[1]][tile_graph.get_index(tile_id)[0]] == 0]
+    collision_tiles = rng.sample(free_tiles, 25)
+
+    kept_tiles = map_generator._get_connected_collision_tiles(
+        collision_layer, collision_tiles, IntVector2(*start), IntVector2(*end), tile_graph)
+    assert kept_tiles == get_greedy_collision_tiles(collision_layer, collision_tiles, start, end, tile_graph)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_generated_map_connects_start_and_end(seed):
+    random.seed(seed)
+    map_config = MapGenerator().map_config
+    tile_graph = TileGraph(Constants.COLUMN_COUNT, Constants.ROW_COUNT)
+    grid = get_grid(map_config.collision_layer, [], tile_graph)
+    start = map_config.start_quadrant.main_index
+    end = map_config.end_quadrant.main_index
+    assert (start.x, start.y) in bfs_distances(grid, (end.x, end.y))
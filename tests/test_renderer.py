@@ -0,0 +1,42 @@
+import itertools
+
+import numpy as np
+import pygame
+
+from game.isometric import DEPTH_COUNT
+from renderer import (ON_MAP_IMAGE_SORT_KEYS, SORT_KEY_DTYPE, SUB_ORDER_COUNT, Renderer, RendererType, RenderLayer,
+    _get_sort_key)
+
+
+def test_sort_keys_order_like_tuples():
+    # Baseline: sort by (layer, depth, sub order) tuples
+    combinations = list(itertools.product(RenderLayer, range(DEPTH_COUNT), range(SUB_ORDER_COUNT)))
+    keys = [_get_sort_key(layer, depth, sub_order) for layer, depth, sub_order in combinations]
+    tuples = [(layer.value, depth, sub_order) for layer, depth, sub_order in combinations]
+    assert sorted(range(len(keys)), key=keys.__getitem__) == sorted(range(len(tuples)), key=tuples.__getitem__)
+    assert len(set(keys)) == len(keys)
+    assert max(keys) <= np.iinfo(SORT_KEY_DTYPE).max
+
+
+def test_tile_sort_keys_follow_depth():
+    tile_sort_keys = ON_MAP_IMAGE_SORT_KEYS[RendererType.ENEMY]
+    assert tile_sort_keys[0][1] == tile_sort_keys[1][0]
+    assert tile_sort_keys[0][0] < tile_sort_keys[0][1] < tile_sort_keys[1][1]
+
+
+def draw_rects(requests: list[tuple[RendererType, str]]) -> pygame.Color:
+    renderer = Renderer(capacity=1)
+    for renderer_type, color in requests:
+        renderer.request_rectangle_draw(renderer_type, color, pygame.Rect(0, 0, 4, 4), 0)
+    screen = pygame.Surface((4, 4))
+    renderer.draw(screen)
+    return screen.get_at((1, 1))
+
+
+def test_draw_orders_by_sort_key_then_request_order():
+    # Sub order 1 draws over sub order 0 even when requested first
+    assert draw_rects([(RendererType.ENEMY_HP_REMAINING, "green"), (RendererType.ENEMY_HP_USED, "red")]) == pygame.Color("green")
+    # Layers win over sub orders
+    assert draw_rects([(RendererType.DEBUG, "blue"), (RendererType.ENEMY_HP_REMAINING, "green")]) == pygame.Color("blue")
+    # Equal keys keep the request order, the buffers grow past their capacity
+    assert draw_rects([(RendererType.DEBUG, "blue"), (RendererType.DEBUG, "white"), (RendererType.DEBUG, "red")]) == pygame.Color("red")
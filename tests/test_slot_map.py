@@ -0,0 +1,49 @@
+import random
+
+from utils.slot_map import Handle, SlotMap
+
+
+def test_stale_handle_misses_reused_slot():
+    slot_map = SlotMap()
+    handle = slot_map.insert("a")
+    assert slot_map.remove(handle) == "a"
+
+    new_handle = slot_map.insert("b")
+    assert new_handle == Handle(handle.index, handle.generation + 1)
+    assert slot_map.get(handle) is None
+    assert slot_map.remove(handle) is None
+    assert slot_map.get(new_handle) == "b"
+
+
+def test_matches_list_with_random_removals():
+    rng = random.Random(0)
+    slot_map = SlotMap()
+    live: dict[Handle, int] = {}
+    stale: list[Handle] = []
+    for value in range(2000):
+        if live and rng.random() < 0.45:
+            handle = rng.choice(list(live))
+            assert slot_map.remove(handle) == live.pop(handle)
+            stale.append(handle)
+        else:
+            next_handle = slot_map.get_next_handle()
+            handle = slot_map.insert(value)
+            assert handle == next_handle
+            live[handle] = value
+
+        assert len(slot_map) == len(live)
+        assert sorted(slot_map) == sorted(live.values())
+        assert dict(slot_map.items()) == live
+
+    assert all(slot_map.get(handle) is None for handle in stale)
+    assert all(slot_map.get(handle) == value for handle, value in live.items())
+
+
+def test_items_allows_removal_while_iterating():
+    slot_map = SlotMap()
+    for value in range(10):
+        slot_map.insert(value)
+    for handle, value in slot_map.items():
+        if value % 2 == 0:
+            slot_map.remove(handle)
+    assert sorted(slot_map) == [1, 3, 5, 7, 9]
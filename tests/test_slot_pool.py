@@ -0,0 +1,49 @@
+import pygame
+
+from constants import Constants
+from game.bullet_manager import BulletManager
+from utils.slot_pool import SlotPool
+
+
+BULLET_CONFIG = {"speed": 100, "color": "yellow", "damage": 1, "effect": ""}
+
+
+def test_allocates_lowest_free_slot():
+    pool = SlotPool(8, 8)
+    slots = [pool.allocate() for _ in range(8)]
+    pool.free_all([slots[6], slots[2], slots[5]])
+    assert [pool.allocate() for _ in range(3)] == [2, 5, 6]
+
+
+def test_shrinks_after_burst_then_steady_load():
+    pool = SlotPool(16, 1024)
+    slots = [pool.allocate() for _ in range(600)]
+    assert pool.capacity == 1024
+
+    # Free in ascending order, the top slots used to be handed out again first
+    live = slots[-4:]
+    pool.free_all(slots[:-4])
+    for _ in range(200):
+        pool.free(live.pop(0))
+        live.append(pool.allocate())
+        pool.shrink()
+
+    assert pool.capacity == 16
+    assert max(live) < 16
+
+
+def test_bullet_pool_shrinks_after_burst():
+    bullet_manager = BulletManager()
+    position = pygame.Vector2(0, 0)
+    target_pos = pygame.Vector2(1, 1)
+    for _ in range(1500):
+        bullet_manager.shoot(position, target_pos, BULLET_CONFIG)
+    assert bullet_manager.pool.capacity == 2048
+
+    for _ in range(3000):
+        bullet_manager.shoot(position, target_pos, BULLET_CONFIG)
+        bullet_manager.update(1 / 30)
+
+    assert bullet_manager.pool.capacity == Constants.BULLET_POOL_CAPACITY
+    assert bullet_manager.capacity == Constants.BULLET_POOL_CAPACITY
+    assert bullet_manager.get_live_slots().max() < Constants.BULLET_POOL_CAPACITY
@@ -0,0 +1,116 @@
+import os
+import random
+
+import numpy as np
+import pygame
+import pytest
+
+from constants import Constants
+from enemy_config import ENEMY_CONFIG
+from enums import GameState
+from events import Event, GlobalEventDispatcher
+from game.spatial_hash import SpatialHash
+from game.targeting import find_weakest_targets
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def find_weakest_by_scan(game, tower):
+    # Baseline: measure the distance to every living enemy, ties go to the earliest spawned
+    range_squared = tower.config.range * tower.config.range
+    in_range = [enemy for enemy in game.enemy_spawner.enemies
+        if enemy.alive() and tower.center.distance_squared_to(enemy.sprite_center) <= range_squared]
+    return min(in_range, key=lambda enemy: (enemy._hp, enemy.spawn_order), default=None)
+
+
+def get_engine_targets(game) -> list:
+    enemy_store = game.enemy_spawner.enemy_store
+    target_state = enemy_store.get_target_state()
+    if game.vectorized_targeting is not None:
+        return game.vectorized_targeting.get_targets(enemy_store)
+    if game.candidate_targeting is not None:
+        return game.candidate_targeting.get_targets(target_state)
+    if game.spatial_hash_targeting is not None:
+        return game.spatial_hash_targeting.get_targets(enemy_store)
+    return [game.find_weakest_in_range(tower, target_state) for tower in game.towers]
+
+
+def test_spatial_hash_query_matches_scan():
+    rng = random.Random(0)
+    points = [(rng.uniform(-300, 300), rng.uniform(-300, 300)) for _ in range(200)]
+    spatial_hash = SpatialHash(64)
+    for item, (x, y) in enumerate(points):
+        spatial_hash.insert(item, x, y)
+
+    for _ in range(50):
+        x, y, radius = rng.uniform(-300, 300), rng.uniform(-300, 300), rng.uniform(0, 150)
+        expected = [item for item, (item_x, item_y) in enumerate(points)
+            if (item_x - x) ** 2 + (item_y - y) ** 2 <= radius * radius]
+        assert spatial_hash.query(x, y, radius) == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_weakest_targets_kernel_matches_loops(seed):
+    rng = np.random.default_rng(seed)
+    tower_centers = rng.uniform(0, 100, (7, 2))
+    tower_ranges = rng.uniform(5, 40, 7)
+    enemy_centers = rng.uniform(0, 100, (30, 2))
+    enemy_hps = rng.integers(1, 4, 30).astype(np.float64) # Few distinct values, plenty of ties
+
+    targets = find_weakest_targets(tower_centers, tower_ranges, enemy_centers, enemy_hps)
+    for tower_index, target in enumerate(targets.tolist()):
+        in_range = [enemy_index for enemy_index in range(30)
+            if np.sum((enemy_centers[enemy_index] - tower_centers[tower_index]) ** 2) <= tower_ranges[tower_index] ** 2]
+        assert target == min(in_range, key=lambda enemy_index: (enemy_hps[enemy_index], enemy_index), default=-1)
+
+
+def test_weakest_targets_kernel_without_enemies():
+    targets = find_weakest_targets(np.zeros((3, 2)), np.ones(3), np.empty((0, 2)), np.empty(0))
+    assert targets.tolist() == [-1, -1, -1]
+
+
+def make_game(monkeypatch, engine: str, seed: int):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    monkeypatch.chdir(ROOT) # Assets load relative to the repository root
+    monkeypatch.setattr(Constants, "TOWER_TARGETING_ENGINE", engine)
+    pygame.init()
+    pygame.display.set_mode((Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT))
+
+    from game.game import Game
+    from state_manager import StateManager
+    random.seed(seed)
+    game = Game(StateManager(GameState.GAME))
+    buttons = game.button_manager.buttons
+    for _ in range(300):
+        if len(game.towers) == 12:
+            break
+        game.energy_manager.energy = 10 ** 6
+        game.selector_index = game.tile_manager.tiles[random.randrange(Constants.ROW_COUNT)][random.randrange(Constants.COLUMN_COUNT)].index
+        game.place(random.choice(buttons))
+    return game
+
+
+@pytest.mark.parametrize("seed", range(2))
+@pytest.mark.parametrize("engine", ["coverage", "candidates", "spatial_hash", "vectorized"])
+def test_engine_matches_scan(monkeypatch, engine, seed):
+    game = make_game(monkeypatch, engine, seed)
+    enemy_config = dict(ENEMY_CONFIG[0])
+    enemy_config["hp"] = 40 # Low enough that enemies die and slots get reused
+
+    dt = 1 / 30
+    checked_targets = 0
+    for frame in range(600):
+        if frame % 10 == 0:
+            GlobalEventDispatcher.dispatch(Event(Constants.EVENT_SPAWN_NEW_ENEMY, {"enemy_config": enemy_config}))
+        targets = get_engine_targets(game)
+        expected_targets = [find_weakest_by_scan(game, tower) for tower in game.towers]
+        assert all(target is expected for target, expected in zip(targets, expected_targets)), frame
+        checked_targets += sum(target is not None for target in targets)
+
+        game.update_towers(dt)
+        game.update_bullet_collisions(dt)
+        game.enemy_spawner.update(dt)
+    assert checked_targets > 0
+    assert len(game.enemy_spawner.enemies) < 600 // 10 # Some enemies died or escaped on the way